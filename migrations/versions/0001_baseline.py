@@ -0,0 +1,118 @@
+"""Baseline planner schema.
+
+Databases created earlier by ``init_db`` already match this revision; mark them with
+``alembic stamp 0001_baseline`` instead of upgrading through it.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-14 00:00:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+_PLAN_STATUS = sa.Enum("draft", "winning", "fallback", name="planstatus")
+_NODE_DOMAIN = sa.Enum("db", "be", "fe", "test", "package", "data_pipeline", name="nodedomain")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "plan",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("project_id", sa.String(), nullable=False),
+        sa.Column("run_id", sa.String(), nullable=False),
+        sa.Column("contract_hash", sa.String(), nullable=False),
+        sa.Column("status", _PLAN_STATUS, nullable=False),
+        sa.Column("score", sa.Numeric(5, 2)),
+        sa.Column("wall_time_ms", sa.Integer()),
+        sa.Column("token_cost", sa.Integer()),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("report_ref", sa.String()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime()),
+        sa.UniqueConstraint("project_id", "run_id", name="uq_plan_project_run"),
+    )
+    op.create_table(
+        "audit_log",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("principal", sa.String(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("old_val", sa.JSON()),
+        sa.Column("new_val", sa.JSON()),
+        sa.Column("correlation_id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "plan_node",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("plan_id", sa.String(), sa.ForeignKey("plan.id"), nullable=False),
+        sa.Column("type", _NODE_DOMAIN, nullable=False),
+        sa.Column("label", sa.String(), nullable=False),
+        sa.Column("instructions", sa.JSON(), nullable=False),
+        sa.Column("artifacts_in", sa.JSON(), nullable=False),
+        sa.Column("artifacts_out", sa.JSON(), nullable=False),
+        sa.Column("token_budget", sa.Integer(), nullable=False),
+        sa.Column("score", sa.JSON(), nullable=False),
+        sa.Column("order_hint", sa.Integer()),
+        sa.Column("summary", sa.Text()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "plan_candidate",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("plan_id", sa.String(), sa.ForeignKey("plan.id"), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Numeric(6, 3), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("trace", sa.JSON(), nullable=False),
+        sa.UniqueConstraint("plan_id", "rank", name="uq_candidate_plan_rank"),
+    )
+    op.create_table(
+        "plan_edge",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("plan_id", sa.String(), sa.ForeignKey("plan.id"), nullable=False),
+        sa.Column("from_node", sa.String(), sa.ForeignKey("plan_node.id"), nullable=False),
+        sa.Column("to_node", sa.String(), sa.ForeignKey("plan_node.id"), nullable=False),
+        sa.Column("artifact_type", sa.String()),
+        sa.Column("description", sa.Text()),
+    )
+    op.create_table(
+        "context_card",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("node_id", sa.String(), sa.ForeignKey("plan_node.id"), nullable=False),
+        sa.Column("contract_slice_ref", sa.String(), nullable=False),
+        sa.Column("interfaces", sa.JSON(), nullable=False),
+        sa.Column("schema_hashes", sa.JSON(), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=False),
+        sa.Column("citations", sa.JSON(), nullable=False),
+        sa.Column("embedding", sa.JSON()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "complexity_features",
+        sa.Column("node_id", sa.String(), sa.ForeignKey("plan_node.id"), primary_key=True),
+        sa.Column("d", sa.Numeric(5, 2), nullable=False),
+        sa.Column("s", sa.Numeric(5, 2), nullable=False),
+        sa.Column("n", sa.Numeric(5, 2), nullable=False),
+        sa.Column("a", sa.Numeric(5, 2), nullable=False),
+        sa.Column("r", sa.Numeric(5, 2), nullable=False),
+        sa.Column("ccs", sa.Numeric(5, 2), nullable=False),
+        sa.Column("recommended_subtasks", sa.Integer(), nullable=False),
+        sa.Column("confidence", sa.Numeric(3, 2), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    for table in ("complexity_features", "context_card", "plan_edge", "plan_candidate", "plan_node", "audit_log", "plan"):
+        op.drop_table(table)
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS nodedomain")
+        op.execute("DROP TYPE IF EXISTS planstatus")
@@ -0,0 +1,131 @@
+"""Bring existing planner databases up to the current storage layout.
+
+- Postgres keys become native ``uuid``. This is required on existing Postgres databases: the
+  models now bind keys as ``uuid`` there, and ``varchar = uuid`` comparisons fail. Keys were
+  always generated with ``uuid.uuid4()``, so every stored value casts cleanly.
+- The plan graph gains indexes for its per-plan and per-node access paths.
+- Postgres JSON documents become ``jsonb``.
+- Timestamps become timezone-aware, and ``created_at``/``updated_at`` default to ``now()`` in
+  the database. Existing values were written with ``datetime.utcnow()``, so they are read as UTC.
+
+Revision ID: 0002_storage_layout
+Revises: 0001_baseline
+Create Date: 2026-10-14 00:00:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0002_storage_layout"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+# Parents before children, so the recreated FKs always point at an already-converted key.
+_KEY_COLUMNS = (
+    ("plan", "id"),
+    ("plan_node", "id"),
+    ("plan_node", "plan_id"),
+    ("plan_edge", "id"),
+    ("plan_edge", "plan_id"),
+    ("plan_edge", "from_node"),
+    ("plan_edge", "to_node"),
+    ("plan_candidate", "id"),
+    ("plan_candidate", "plan_id"),
+    ("context_card", "id"),
+    ("context_card", "node_id"),
+    ("complexity_features", "node_id"),
+    ("audit_log", "id"),
+)
+
+# (constraint, table, column, referenced table); names follow Postgres' default FK naming.
+_FOREIGN_KEYS = (
+    ("plan_node_plan_id_fkey", "plan_node", "plan_id", "plan"),
+    ("plan_edge_plan_id_fkey", "plan_edge", "plan_id", "plan"),
+    ("plan_edge_from_node_fkey", "plan_edge", "from_node", "plan_node"),
+    ("plan_edge_to_node_fkey", "plan_edge", "to_node", "plan_node"),
+    ("plan_candidate_plan_id_fkey", "plan_candidate", "plan_id", "plan"),
+    ("context_card_node_id_fkey", "context_card", "node_id", "plan_node"),
+    ("complexity_features_node_id_fkey", "complexity_features", "node_id", "plan_node"),
+)
+
+
+def _convert_keys(type_: sa.types.TypeEngine, cast: str) -> None:
+    # Postgres will not retype a column while a foreign key ties it to a column of the old type.
+    for name, table, _, _ in _FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+    for table, column in _KEY_COLUMNS:
+        op.alter_column(table, column, type_=type_, postgresql_using=f"{column}::{cast}")
+    for name, table, column, referred in _FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referred, [column], ["id"])
+
+
+# (name, table, columns)
+_INDEXES = (
+    ("ix_plan_node_plan_order", "plan_node", ["plan_id", "order_hint"]),
+    ("ix_plan_edge_plan_to", "plan_edge", ["plan_id", "to_node"]),
+    ("ix_plan_edge_from_node", "plan_edge", ["from_node"]),
+    ("ix_context_card_node_id", "context_card", ["node_id"]),
+)
+
+_JSON_COLUMNS = (
+    ("plan", "params"),
+    ("plan_node", "instructions"),
+    ("plan_node", "artifacts_in"),
+    ("plan_node", "artifacts_out"),
+    ("plan_node", "score"),
+    ("plan_candidate", "params"),
+    ("plan_candidate", "trace"),
+    ("context_card", "interfaces"),
+    ("context_card", "schema_hashes"),
+    ("context_card", "citations"),
+    ("audit_log", "old_val"),
+    ("audit_log", "new_val"),
+)
+
+
+def _convert_documents(type_: sa.types.TypeEngine, cast: str) -> None:
+    for table, column in _JSON_COLUMNS:
+        op.alter_column(table, column, type_=type_, postgresql_using=f"{column}::{cast}")
+
+
+# table -> (columns stamped by the database, columns without a default)
+_TIMESTAMPS = {
+    "plan": (("created_at", "updated_at"), ("deleted_at",)),
+    "plan_node": (("created_at", "updated_at"), ()),
+    "context_card": (("created_at",), ()),
+    "audit_log": (("created_at",), ()),
+}
+
+
+def _convert_timestamps(timezone: bool) -> None:
+    # Batch mode lets SQLite rebuild the table to change defaults; Postgres gets plain ALTERs.
+    for table, (stamped, plain) in _TIMESTAMPS.items():
+        with op.batch_alter_table(table) as batch:
+            for column in stamped + plain:
+                batch.alter_column(
+                    column,
+                    type_=sa.DateTime(timezone=timezone),
+                    server_default=sa.func.now() if timezone and column in stamped else None,
+                    postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                )
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        _convert_keys(sa.Uuid(as_uuid=False), "uuid")
+        _convert_documents(JSONB(), "jsonb")
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+    _convert_timestamps(timezone=True)
+
+
+def downgrade() -> None:
+    _convert_timestamps(timezone=False)
+    for name, table, _ in _INDEXES:
+        op.drop_index(name, table_name=table)
+    if op.get_context().dialect.name == "postgresql":
+        _convert_documents(sa.JSON(), "json")
+        _convert_keys(sa.String(), "text")
@@ -0,0 +1,59 @@
+"""Store context card embeddings as packed float32 bytes.
+
+Adds ``context_card.embedding_blob``, packs every existing JSON ``embedding`` into it as
+little-endian float32 (the layout ``ContextCard.embedding`` reads back), then drops the JSON
+column. The backfill reads rows, so run this revision online rather than with ``--sql``.
+
+Revision ID: 0003_packed_card_embeddings
+Revises: 0002_storage_layout
+Create Date: 2026-10-14 00:00:00
+"""
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_packed_card_embeddings"
+down_revision = "0002_storage_layout"
+branch_labels = None
+depends_on = None
+
+_CARDS = sa.table(
+    "context_card",
+    sa.column("id", sa.String()),
+    sa.column("embedding", sa.JSON()),
+    sa.column("embedding_blob", sa.LargeBinary()),
+)
+
+
+def _pack(values: list[float]) -> bytes:
+    return struct.pack(f"<{len(values)}f", *values)
+
+
+def _unpack(blob: bytes) -> list[float]:
+    return list(struct.unpack(f"<{len(blob) // 4}f", blob))
+
+
+def _copy(source: str, target: str, convert: Callable[[Any], Any]) -> None:
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(_CARDS.c.id, _CARDS.c[source]).where(_CARDS.c[source].is_not(None))).all()
+    if rows:
+        stmt = _CARDS.update().where(_CARDS.c.id == sa.bindparam("card_id")).values({target: sa.bindparam("value")})
+        bind.execute(stmt, [{"card_id": card_id, "value": convert(value)} for card_id, value in rows])
+
+
+def upgrade() -> None:
+    op.add_column("context_card", sa.Column("embedding_blob", sa.LargeBinary()))
+    _copy("embedding", "embedding_blob", _pack)
+    with op.batch_alter_table("context_card") as batch:
+        batch.drop_column("embedding")
+
+
+def downgrade() -> None:
+    op.add_column("context_card", sa.Column("embedding", sa.JSON()))
+    _copy("embedding_blob", "embedding", _unpack)
+    with op.batch_alter_table("context_card") as batch:
+        batch.drop_column("embedding_blob")
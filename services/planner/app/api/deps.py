@@ -9,8 +9,8 @@ from ..persistence.db import get_session_factory
 
 
 async def get_db_session() -> AsyncIterator[AsyncSession]:
-    session_factory = get_session_factory()
-    async with session_factory() as session:
+    """Yield a session that commits on success (write routes)."""
+    async with get_session_factory()() as session:
         try:
             yield session
             await session.commit()
@@ -19,4 +19,10 @@ async def get_db_session() -> AsyncIterator[AsyncSession]:
             raise
 
 
-__all__ = ["get_db_session"]
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """Yield a session for read-only routes; closing it releases the connection without a COMMIT."""
+    async with get_session_factory()() as session:
+        yield session
+
+
+__all__ = ["get_db_session", "get_read_session"]
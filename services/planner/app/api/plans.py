@@ -1,35 +1,59 @@
 """Plan management API."""
 from __future__ import annotations
 
-import json
+import asyncio
 import os
 import uuid
+from http import HTTPStatus
+from pathlib import Path
 from typing import Any, Dict, List
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field, ConfigDict
-from sqlalchemy import select
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
-from ..domain.planner_service import PlanCreateParams, PlannerOrchestrator
-from ..domain.ingest import load_contract, parse_prd, synthesize_contract
+from ..config import get_settings
+from ..domain.planner_service import PlanCreateParams, PlannerOrchestrator, get_orchestrator
+from ..domain.ingest import ContractArtifact, load_contract, recall_contract, remember_contract
 from ..domain.coverage import compute_coverage
-from ..persistence.models import ComplexityFeatures, Plan, PlanEdge, PlanNode
-from .deps import get_db_session
+from ..persistence.cache import ResponseCache, get_response_cache
+from ..persistence.models import NodeDomain, Plan, PlanEdge, PlanNode, is_uuid_key
+from ..persistence.storage import get_artifact_storage
+from .deps import get_db_session, get_read_session
+from .responses import ORJSONResponse
 
 router = APIRouter(prefix="/plans", tags=["plans"])
 
 
+def _read_ref_bytes(ref: str, max_bytes: int) -> bytes | None:
+    """Read a local ref, refusing files larger than ``max_bytes`` before buffering them."""
+    try:
+        size = os.path.getsize(ref)
+    except OSError:
+        return None
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Referenced file exceeds {max_bytes} bytes",
+        )
+    return Path(ref).read_bytes()
+
+
 class PRDPayload(BaseModel):
     text: str | None = Field(default=None, description="Raw PRD text")
     ref: str | None = Field(default=None, description="Reference to PRD location")
 
-    def require_text(self) -> str:
+    async def require_text(self) -> str:
         if self.text:
             return self.text
-        if self.ref and os.path.exists(self.ref):
-            with open(self.ref, "r", encoding="utf-8") as handle:
-                return handle.read()
+        if self.ref:
+            data = await asyncio.to_thread(_read_ref_bytes, self.ref, get_settings().security.max_request_bytes)
+            if data is not None:
+                return data.decode("utf-8")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="PRD text or accessible ref required")
 
 
@@ -37,19 +61,15 @@ class ContractPayload(BaseModel):
     document: dict[str, Any] | None = Field(default=None)
     ref: str | None = None
 
-    def require_document(self, prd_text: str | None = None) -> dict[str, Any]:
+    async def provided_document(self) -> dict[str, Any] | None:
+        """Return the caller's contract, or ``None`` when it should be synthesized from the PRD."""
         if self.document:
             return self.document
-        if self.ref and os.path.exists(self.ref):
-            with open(self.ref, "r", encoding="utf-8") as handle:
-                return json.load(handle)
-        if prd_text is not None:
-            prd = parse_prd(prd_text)
-            return synthesize_contract(prd)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Contract document or synthesizable PRD required",
-        )
+        if self.ref:
+            data = await asyncio.to_thread(_read_ref_bytes, self.ref, get_settings().security.max_request_bytes)
+            if data is not None:
+                return orjson.loads(data)
+        return None
 
 
 class PlanOptions(BaseModel):
@@ -102,19 +122,56 @@ class TaskListItem(BaseModel):
     model_config = ConfigDict(populate_by_name=True, ser_json_t="alias")
 
 
+_TASK_LIST_ADAPTER = TypeAdapter(List[TaskListItem])
+# Enum ``.value`` is a descriptor call; per-row serializers read the label from this table instead.
+_DOMAIN_LABELS = {domain: domain.value for domain in NodeDomain}
+
+
+async def _stored_contract_document(ingest_params: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the contract a plan was built from, reading it back from artifact storage."""
+    # Plans created before contracts moved to storage carry the document inline.
+    document = ingest_params.get("contract")
+    if document is None and ingest_params.get("contractRef"):
+        document = await get_artifact_storage().get_json(ingest_params["contractRef"])
+    return document
+
+
+async def _load_contract_cached(contract_hash: str, ingest_params: dict[str, Any]) -> ContractArtifact | None:
+    """Return the parsed contract for a plan, memoized by its stored content hash."""
+    artifact = recall_contract(contract_hash)
+    if artifact is not None:
+        return artifact
+    document = await _stored_contract_document(ingest_params)
+    if not document:
+        return None
+    # Stored contracts were validated (or synthesized) when the plan was created.
+    artifact = load_contract(document, validate=False)
+    remember_contract(artifact)
+    return artifact
+
+
 def _plan_not_found(plan_id: str) -> HTTPException:
     return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Plan {plan_id} not found")
 
 
+def _plan_id(plan_id: str) -> str:
+    """Path guard: a value that is not a UUID cannot name a plan, so skip the query."""
+    if not is_uuid_key(plan_id):
+        raise _plan_not_found(plan_id)
+    return plan_id
+
+
 @router.post("", response_model=PlanSummaryResponse, status_code=status.HTTP_201_CREATED)
 async def create_plan(
     request: PlanCreateRequest,
     session: AsyncSession = Depends(get_db_session),
+    orchestrator: PlannerOrchestrator = Depends(get_orchestrator),
 ):
-    orchestrator = PlannerOrchestrator(session)
-    prd_text = request.prd.require_text()
-    contract_document = request.contract.require_document(prd_text)
+    prd_text = await request.prd.require_text()
+    # Synthesis is left to the orchestrator so the generated contract skips spec validation.
+    contract_document = await request.contract.provided_document()
     plan = await orchestrator.create_plan(
+        session,
         PlanCreateParams(
             project_id=request.project_id,
             run_id=request.run_id,
@@ -131,12 +188,10 @@ async def create_plan(
 async def _build_summary(session: AsyncSession, plan: Plan) -> PlanSummaryResponse:
     params = plan.params or {}
     ingest_params = params.get("ingest", {})
-    contract = ingest_params.get("contract")
-    prd_text = ingest_params.get("prdText", "")
-    if contract:
-        contract_artifact = load_contract(contract)
+    contract_artifact = await _load_contract_cached(plan.contract_hash, ingest_params)
+    if contract_artifact is not None:
         covered_ops = await _covered_ops(session, plan.id)
-        coverage = compute_coverage(contract_artifact.operations, covered_ops)
+        coverage = compute_coverage(contract_artifact, covered_ops)
     else:
         coverage = compute_coverage([], [])
     return PlanSummaryResponse(
@@ -146,7 +201,7 @@ async def _build_summary(session: AsyncSession, plan: Plan) -> PlanSummaryRespon
         status=plan.status.value,
         reportRef=plan.report_ref,
         coverage={
-            "missingOperations": coverage.missing_operations,
+            "missingOperations": sorted(coverage.missing_operations),
             "totalOperations": coverage.total_operations,
         },
         createdAt=plan.created_at.isoformat() if plan.created_at else None,
@@ -154,46 +209,97 @@ async def _build_summary(session: AsyncSession, plan: Plan) -> PlanSummaryRespon
     )
 
 
-async def _covered_ops(session: AsyncSession, plan_id: str) -> List[str]:
-    result = await session.execute(
-        select(PlanNode).where(PlanNode.plan_id == plan_id).order_by(PlanNode.order_hint)
-    )
-    nodes = result.scalars().all()
-    ops: List[str] = []
-    for node in nodes:
-        ops.extend(node.instructions.get("contractOps", []))
+async def _covered_ops(session: AsyncSession, plan_id: str) -> set[str]:
+    result = await session.execute(select(PlanNode.instructions).where(PlanNode.plan_id == plan_id))
+    ops: set[str] = set()
+    for instructions in result.scalars():
+        ops.update(instructions.get("contractOps", []))
     return ops
 
 
+async def _plan_cache_key(session: AsyncSession, kind: str, plan_id: str) -> str:
+    """Return a cache key bound to the plan version, raising 404 for unknown plans."""
+    result = await session.execute(select(Plan.updated_at).where(Plan.id == plan_id))
+    row = result.first()
+    if row is None:
+        raise _plan_not_found(plan_id)
+    (updated_at,) = row
+    version = updated_at.isoformat() if updated_at else "0"
+    return f"{kind}:{plan_id}:{version}"
+
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/{plan_id}", response_model=PlanSummaryResponse)
-async def get_plan(plan_id: str, session: AsyncSession = Depends(get_db_session)):
+async def get_plan(
+    plan_id: str = Depends(_plan_id),
+    session: AsyncSession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    if not cache.enabled:
+        plan = await session.get(Plan, plan_id)
+        if not plan:
+            raise _plan_not_found(plan_id)
+        return await _build_summary(session, plan)
+
+    cache_key = await _plan_cache_key(session, "plan", plan_id)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return _json_response(cached)
     plan = await session.get(Plan, plan_id)
     if not plan:
         raise _plan_not_found(plan_id)
-    return await _build_summary(session, plan)
+    summary = await _build_summary(session, plan)
+    body = summary.model_dump_json(by_alias=True).encode("utf-8")
+    await cache.set(cache_key, body)
+    return _json_response(body)
+
+
+async def _dependency_map(session: AsyncSession, plan_id: str) -> Dict[str, List[str]]:
+    """Aggregate upstream node IDs per node in the database."""
+    postgres = session.bind.dialect.name == "postgresql"
+    aggregate = func.array_agg(PlanEdge.from_node) if postgres else func.group_concat(PlanEdge.from_node, ",")
+    result = await session.execute(
+        select(PlanEdge.to_node, aggregate).where(PlanEdge.plan_id == plan_id).group_by(PlanEdge.to_node)
+    )
+    if postgres:
+        return {to_node: list(from_nodes) for to_node, from_nodes in result}
+    return {to_node: from_nodes.split(",") for to_node, from_nodes in result}
 
 
 @router.get("/{plan_id}/tasks.json", response_model=List[TaskListItem])
-async def get_task_list(plan_id: str, session: AsyncSession = Depends(get_db_session)):
-    plan = await session.get(Plan, plan_id)
-    if not plan:
+async def get_task_list(plan_id: str = Depends(_plan_id), session: AsyncSession = Depends(get_read_session)):
+    if await session.scalar(select(Plan.id).where(Plan.id == plan_id)) is None:
         raise _plan_not_found(plan_id)
     nodes_result = await session.execute(
-        select(PlanNode).where(PlanNode.plan_id == plan_id).order_by(PlanNode.order_hint)
+        select(PlanNode)
+        .options(
+            load_only(
+                PlanNode.id,
+                PlanNode.label,
+                PlanNode.type,
+                PlanNode.summary,
+                PlanNode.instructions,
+                PlanNode.artifacts_in,
+                PlanNode.artifacts_out,
+                PlanNode.token_budget,
+                PlanNode.score,
+            )
+        )
+        .where(PlanNode.plan_id == plan_id)
+        .order_by(PlanNode.order_hint)
     )
     nodes = nodes_result.scalars().all()
-    complexities_result = await session.execute(
-        select(ComplexityFeatures).where(ComplexityFeatures.node_id.in_([node.id for node in nodes]))
-    )
-    complexities = {row.node_id: row for row in complexities_result.scalars()}
-    edges_result = await session.execute(select(PlanEdge).where(PlanEdge.plan_id == plan_id))
-    dependency_map: Dict[str, List[str]] = {node.id: [] for node in nodes}
-    for edge in edges_result.scalars():
-        dependency_map[edge.to_node].append(edge.from_node)
+    # Complexity is served from the denormalized ``PlanNode.score`` column, so the
+    # ComplexityFeatures rows are not needed here.
+    dependency_map = await _dependency_map(session, plan_id)
 
+    # Rows come from our own persisted plan, so items are built without re-validation
+    # and the whole list is encoded once by pydantic-core.
     items: List[TaskListItem] = []
     for node in nodes:
-        features = complexities.get(node.id)
         node_score = node.score or {}
         complexity = {
             "score_0_100": node_score.get("ccs", 0),
@@ -203,13 +309,13 @@ async def get_task_list(plan_id: str, session: AsyncSession = Depends(get_db_ses
         }
         model_class = node_score.get("modelClass", "Class-200K")
         items.append(
-            TaskListItem(
+            TaskListItem.model_construct(
                 id=node.id,
                 title=node.label,
-                domain=node.type.value,
+                domain=_DOMAIN_LABELS[node.type],
                 description=node.summary or node.label,
                 requirementsRefs=node.instructions.get("requirementsRefs", []),
-                dependencies=dependency_map[node.id],
+                dependencies=dependency_map.get(node.id, []),
                 acceptanceCriteria=node.instructions.get("acceptanceCriteria", []),
                 artifactsIn=node.artifacts_in,
                 artifactsOut=node.artifacts_out,
@@ -218,53 +324,79 @@ async def get_task_list(plan_id: str, session: AsyncSession = Depends(get_db_ses
                 modelClass=model_class,
             )
         )
-    return items
+    return _json_response(_TASK_LIST_ADAPTER.dump_json(items))
 
 
-@router.get("/{plan_id}/graph")
-async def get_graph(plan_id: str, session: AsyncSession = Depends(get_db_session)):
-    plan = await session.get(Plan, plan_id)
-    if not plan:
-        raise _plan_not_found(plan_id)
+@router.get("/{plan_id}/graph", response_class=ORJSONResponse)
+async def get_graph(
+    plan_id: str = Depends(_plan_id),
+    session: AsyncSession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    cache_key = await _plan_cache_key(session, "graph", plan_id)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return _json_response(cached)
     nodes_result = await session.execute(
-        select(PlanNode).where(PlanNode.plan_id == plan_id).order_by(PlanNode.order_hint)
+        select(PlanNode.id, PlanNode.label, PlanNode.type, PlanNode.token_budget, PlanNode.order_hint)
+        .where(PlanNode.plan_id == plan_id)
+        .order_by(PlanNode.order_hint)
+    )
+    edges_result = await session.execute(
+        select(PlanEdge.from_node, PlanEdge.to_node, PlanEdge.description).where(PlanEdge.plan_id == plan_id)
     )
-    edges_result = await session.execute(select(PlanEdge).where(PlanEdge.plan_id == plan_id))
     nodes = [
         {
-            "id": node.id,
-            "label": node.label,
-            "domain": node.type.value,
-            "tokenBudget": node.token_budget,
-            "order": node.order_hint,
+            "id": node_id,
+            "label": label,
+            "domain": _DOMAIN_LABELS[domain],
+            "tokenBudget": token_budget,
+            "order": order_hint,
         }
-        for node in nodes_result.scalars()
+        for node_id, label, domain, token_budget, order_hint in nodes_result
     ]
     edges = [
-        {"from": edge.from_node, "to": edge.to_node, "description": edge.description}
-        for edge in edges_result.scalars()
+        {"from": from_node, "to": to_node, "description": description}
+        for from_node, to_node, description in edges_result
     ]
-    return {"nodes": nodes, "edges": edges}
-
-
-@router.get("/{plan_id}/report")
-async def get_report(plan_id: str, session: AsyncSession = Depends(get_db_session)):
-    plan = await session.get(Plan, plan_id)
-    if not plan:
+    graph = {"nodes": nodes, "edges": edges}
+    if not cache.enabled:
+        return graph
+    body = orjson.dumps(graph)
+    await cache.set(cache_key, body)
+    return _json_response(body)
+
+
+@router.get("/{plan_id}/report", response_class=ORJSONResponse)
+async def get_report(
+    plan_id: str = Depends(_plan_id),
+    validate: bool = False,
+    session: AsyncSession = Depends(get_read_session),
+):
+    # Only the ref is needed, so skip hydrating the Plan row and its JSON params.
+    row = (await session.execute(select(Plan.report_ref).where(Plan.id == plan_id))).first()
+    if row is None:
         raise _plan_not_found(plan_id)
-    if not plan.report_ref:
+    (report_ref,) = row
+    if not report_ref:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not generated")
-    if plan.report_ref.startswith("file://"):
-        path = plan.report_ref[len("file://") :]
+    if report_ref.startswith("file://"):
+        path = report_ref[len("file://") :]
         if not os.path.exists(path):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report file missing")
-        with open(path, "r", encoding="utf-8") as handle:
-            return json.load(handle)
-    return {"reportRef": plan.report_ref}
+        if validate:
+            return ORJSONResponse(content=orjson.loads(await asyncio.to_thread(Path(path).read_bytes)))
+        # Reports are stored as JSON already; hand the bytes straight to the socket.
+        return FileResponse(path, media_type="application/json")
+    return {"reportRef": report_ref}
 
 
 @router.post("/{plan_id}/rerun", response_model=PlanSummaryResponse)
-async def rerun_plan(plan_id: str, session: AsyncSession = Depends(get_db_session)):
+async def rerun_plan(
+    plan_id: str = Depends(_plan_id),
+    session: AsyncSession = Depends(get_db_session),
+    orchestrator: PlannerOrchestrator = Depends(get_orchestrator),
+):
     plan = await session.get(Plan, plan_id)
     if not plan:
         raise _plan_not_found(plan_id)
@@ -272,13 +404,18 @@ async def rerun_plan(plan_id: str, session: AsyncSession = Depends(get_db_sessio
     ingest_params = params.get("ingest")
     if not ingest_params:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Plan does not contain rerunnable payloads")
-    orchestrator = PlannerOrchestrator(session)
     new_plan = await orchestrator.create_plan(
+        session,
         PlanCreateParams(
             project_id=plan.project_id,
             run_id=str(uuid.uuid4()),
             prd_text=ingest_params.get("prdText", ""),
-            contract_document=ingest_params.get("contract"),
+            # Synthesized contracts are rebuilt from the PRD, so only provided ones are read back.
+            contract_document=(
+                await _stored_contract_document(ingest_params)
+                if ingest_params.get("contractSource") == "provided"
+                else None
+            ),
             principal="api",
             correlation_id=str(uuid.uuid4()),
             options=params.get("requestOptions"),
@@ -2,39 +2,91 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Sequence
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Sequence
 
 import httpx
-from authlib.jose import JsonWebKey, jwt
+import jwt
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from ..config import PlannerSettings, get_settings
+from ..http_client import get_http_client
+
+_ALGORITHMS = ["RS256", "ES256"]
+_CLAIMS_CACHE_BUCKET_S = 5
+_CLAIMS_CACHE_SIZE = 1024
 
 
 class OIDCVerifier:
     """Validate JWT tokens using JWKS discovery."""
 
-    def __init__(self, settings: PlannerSettings) -> None:
+    def __init__(self, settings: PlannerSettings, client: httpx.AsyncClient | None = None) -> None:
         self._settings = settings
-        self._jwks: JsonWebKey | None = None
+        self._client = client
+        self._keys: dict[str, Any] | None = None
+        self._jwks_expiry: float = 0.0
+        self._jwks_fetched_at: float = 0.0
+        self._etag: str | None = None
         self._lock = asyncio.Lock()
         self._security = HTTPBearer(auto_error=False)
-
-    async def _get_jwks(self) -> JsonWebKey:
+        self._claims_cache: OrderedDict[tuple[str, int], dict] = OrderedDict()
+
+    def _jwks_fresh(self, force: bool) -> bool:
+        if self._keys is None:
+            return False
+        now = time.monotonic()
+        if force:
+            return now - self._jwks_fetched_at < self._settings.security.jwks_min_refresh_s
+        return now < self._jwks_expiry
+
+    async def _get_jwks(self, force: bool = False) -> dict[str, Any]:
+        """Return the issuer's signing keys indexed by ``kid``.
+
+        ``force`` refetches before the TTL expires, at most once per ``jwks_min_refresh_s``.
+        """
+        if self._jwks_fresh(force):
+            return self._keys
         async with self._lock:
-            if self._jwks is not None:
-                return self._jwks
+            if self._jwks_fresh(force):
+                return self._keys
             issuer = self._settings.security.oidc_issuer_url
             if not issuer:
                 raise RuntimeError("OIDC issuer URL is not configured")
             jwks_url = issuer.rstrip("/") + "/.well-known/jwks.json"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_url, timeout=10)
-                response.raise_for_status()
-            data = response.json()
-            self._jwks = JsonWebKey.import_key_set(data)
-            return self._jwks
+            headers = {"If-None-Match": self._etag} if self._etag and self._keys is not None else {}
+            client = self._client or get_http_client()
+            response = await client.get(jwks_url, headers=headers, timeout=10)
+            ttl = self._settings.security.jwks_cache_ttl_s
+            self._jwks_fetched_at = time.monotonic()
+            if response.status_code == httpx.codes.NOT_MODIFIED and self._keys is not None:
+                self._jwks_expiry = time.monotonic() + ttl
+                return self._keys
+            response.raise_for_status()
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+            self._keys = {jwk.key_id: jwk.key for jwk in jwk_set.keys if jwk.key_id}
+            self._etag = response.headers.get("etag")
+            self._jwks_expiry = time.monotonic() + ttl
+            return self._keys
+
+    def _cached_claims(self, cache_key: tuple[str, int]) -> dict | None:
+        claims = self._claims_cache.get(cache_key)
+        if claims is None:
+            return None
+        exp = claims.get("exp")
+        if exp is not None and exp <= time.time():
+            del self._claims_cache[cache_key]
+            return None
+        self._claims_cache.move_to_end(cache_key)
+        return claims
+
+    def _store_claims(self, cache_key: tuple[str, int], claims: dict) -> None:
+        self._claims_cache[cache_key] = claims
+        if len(self._claims_cache) > _CLAIMS_CACHE_SIZE:
+            self._claims_cache.popitem(last=False)
 
     async def verify(self, credentials: HTTPAuthorizationCredentials | None, required_roles: Sequence[str]) -> dict:
         if not self._settings.security.oidc_issuer_url:
@@ -44,19 +96,11 @@ class OIDCVerifier:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
 
         token = credentials.credentials
-        jwks = await self._get_jwks()
-        try:
-            claims = jwt.decode(token, jwks)
-            claims.validate()
-        except Exception as exc:  # pragma: no cover - error path
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
-
-        issuer = self._settings.security.oidc_issuer_url
-        audience = self._settings.security.oidc_audience
-        if issuer and claims.get("iss") != issuer:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid issuer")
-        if audience and audience not in set(claims.get("aud", []) if isinstance(claims.get("aud"), list) else [claims.get("aud")]):
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid audience")
+        cache_key = (hashlib.sha256(token.encode("utf-8")).hexdigest(), int(time.time() // _CLAIMS_CACHE_BUCKET_S))
+        claims = self._cached_claims(cache_key)
+        if claims is None:
+            claims = await self._decode(token)
+            self._store_claims(cache_key, claims)
 
         if required_roles:
             claim_name = self._settings.security.role_claim
@@ -65,7 +109,33 @@ class OIDCVerifier:
                 roles = [roles]
             if not set(required_roles).intersection(roles):
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
-        return claims
+        # Callers own their copy; the cached claims are shared by every request with this token.
+        return copy.deepcopy(claims)
+
+    async def _decode(self, token: str) -> dict:
+        issuer = self._settings.security.oidc_issuer_url
+        audience = self._settings.security.oidc_audience
+        keys = await self._get_jwks()
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            if kid not in keys:
+                # The issuer may have rotated keys since the last fetch.
+                keys = await self._get_jwks(force=True)
+            key = keys[kid]
+            return jwt.decode(
+                token,
+                key,
+                algorithms=_ALGORITHMS,
+                audience=audience,
+                issuer=issuer,
+                options={"verify_aud": audience is not None},
+            )
+        except jwt.InvalidIssuerError as exc:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid issuer") from exc
+        except jwt.InvalidAudienceError as exc:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid audience") from exc
+        except (jwt.PyJWTError, KeyError) as exc:  # pragma: no cover - error path
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
     async def __call__(self, required_roles: Sequence[str]) -> dict:
         credentials = await self._security(None)
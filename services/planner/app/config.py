@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Any, Literal
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,10 +12,14 @@ class SecuritySettings(BaseModel):
     oidc_issuer_url: str | None = None
     oidc_audience: str | None = None
     role_claim: str = "roles"
+    jwks_cache_ttl_s: int = 600
+    jwks_min_refresh_s: int = 30
     webhook_hmac_secret: str | None = None
     max_request_bytes: int = 10_000_000
     rate_limit_qps: int = 5
 
+    model_config = ConfigDict(frozen=True)
+
 
 class PlannerTuning(BaseModel):
     window_headroom_pct: float = Field(default=0.1, ge=0.05, le=0.1)
@@ -29,14 +33,21 @@ class PlannerTuning(BaseModel):
     abort_if_nodes_gt: int = 10_000
     token_budget_floor: int = 2_000
 
-    model_config = SettingsConfigDict(populate_by_name=True)
+    model_config = SettingsConfigDict(populate_by_name=True, frozen=True)
 
 
 class ObservabilitySettings(BaseModel):
     otel_service_name: str = "taskmaster-planner"
     otel_exporter_otlp_endpoint: str | None = None
+    # gRPC writes protobuf straight to an HTTP/2 stream; the endpoint format differs per protocol.
+    otel_exporter_otlp_protocol: Literal["http/protobuf", "grpc"] = "http/protobuf"
+    otel_span_queue_size: int = 4096
+    otel_span_batch_size: int = 1024
+    otel_span_schedule_delay_ms: int = 1000
     log_level: str = "INFO"
 
+    model_config = ConfigDict(frozen=True)
+
 
 class IntelligenceStudioSettings(BaseModel):
     flow_url: str = Field(
@@ -44,6 +55,16 @@ class IntelligenceStudioSettings(BaseModel):
         description="Base URL for Intelligence Studio flow execution",
     )
     api_key: str = Field(default="", description="API key for Intelligence Studio access")
+    connect_timeout_s: float = 5.0
+    read_timeout_s: float = 45.0
+    write_timeout_s: float = 10.0
+    pool_timeout_s: float = 5.0
+    max_attempts: int = Field(default=3, ge=1)
+    retry_backoff_s: float = 0.1
+    retry_backoff_max_s: float = 2.0
+    max_inflight: int = Field(default=32, ge=1)
+
+    model_config = ConfigDict(frozen=True)
 
 
 class StorageSettings(BaseModel):
@@ -51,11 +72,20 @@ class StorageSettings(BaseModel):
         default="sqlite+aiosqlite:///./taskmaster.db",
         description="SQLAlchemy async database URL (Postgres 15 in production)",
     )
+    pool_size: int = 20
+    max_overflow: int = 40
+    pool_timeout: int = 30
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
+    pool_use_lifo: bool = True
     redis_url: str | None = None
+    response_cache_ttl_s: int = 3600
     s3_endpoint: str | None = None
     s3_region: str | None = None
     s3_bucket: str | None = None
 
+    model_config = ConfigDict(frozen=True)
+
 
 class PlannerSettings(BaseSettings):
     security: SecuritySettings = SecuritySettings()
@@ -65,13 +95,18 @@ class PlannerSettings(BaseSettings):
     storage: StorageSettings = StorageSettings()
     environment: Literal["dev", "qa", "prod"] | str = "dev"
 
-    model_config = SettingsConfigDict(env_nested_delimiter="__", env_prefix="PLANNER_", case_sensitive=False)
+    model_config = SettingsConfigDict(
+        env_nested_delimiter="__",
+        env_prefix="PLANNER_",
+        case_sensitive=False,
+        frozen=True,
+    )
 
 
-@lru_cache(maxsize=1)
-def get_settings(**kwargs: Any) -> PlannerSettings:
-    """Return cached settings instance."""
-    return PlannerSettings(**kwargs)
+@lru_cache(maxsize=None)
+def get_settings() -> PlannerSettings:
+    """Return the process-wide, immutable settings snapshot (built on first use)."""
+    return PlannerSettings()
 
 
-__all__ = ["PlannerSettings", "get_settings"]
+__all__ = ["PlannerSettings", "StorageSettings", "get_settings"]
@@ -1,37 +1,49 @@
 """Client for invoking Intelligence Studio flows."""
 from __future__ import annotations
 
-import json
+import asyncio
 import time
 import uuid
+from functools import lru_cache
 from typing import Any, Dict
 
 import httpx
+import orjson
 import structlog
 
 from ..config import PlannerSettings, get_settings
+from ..http_client import get_http_client
 
 logger = structlog.get_logger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _encode_system_message(system: str) -> bytes:
+    """Encode the system message once; prompts are usually module constants."""
+    return orjson.dumps({"role": "system", "content": system})
+
+
 class AIClient:
-    """Wrapper around the Intelligence Studio flow endpoint."""
+    """Wrapper around the Intelligence Studio flow endpoint.
+
+    Each client caps its own concurrent calls at ``max_inflight``; share one instance to share the cap.
+    """
 
-    def __init__(self, settings: PlannerSettings | None = None) -> None:
+    def __init__(self, settings: PlannerSettings | None = None, client: httpx.AsyncClient | None = None) -> None:
         self._settings = settings or get_settings()
+        self._client = client
+        self._inflight = asyncio.Semaphore(self._settings.intelligence_studio.max_inflight)
 
-    async def chat(self, system: str, user: str, session_id: str | None = None, timeout: float = 45.0) -> tuple[str, dict[str, int]]:
+    async def chat(self, system: str, user: str, session_id: str | None = None, timeout: float | None = None) -> tuple[str, dict[str, int]]:
         settings = self._settings.intelligence_studio
         if not settings.api_key:
             raise RuntimeError("Intelligence Studio API key is not configured")
         session = session_id or str(uuid.uuid4())
+        messages = b"[" + _encode_system_message(system) + b"," + orjson.dumps({"role": "user", "content": user}) + b"]"
         payload = {
             "output_type": "chat",
             "input_type": "chat",
-            "input_value": json.dumps([
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ]),
+            "input_value": messages.decode("utf-8"),
             "session_id": session,
         }
         headers = {
@@ -39,9 +51,30 @@ class AIClient:
             "Content-Type": "application/json",
         }
 
-        start = time.perf_counter()
-        async with httpx.AsyncClient() as client:
-            response = await client.post(settings.flow_url, headers=headers, json=payload, timeout=timeout)
+        client = self._client or get_http_client()
+        body = orjson.dumps(payload)
+        request_timeout = httpx.Timeout(
+            connect=settings.connect_timeout_s,
+            read=timeout if timeout is not None else settings.read_timeout_s,
+            write=settings.write_timeout_s,
+            pool=settings.pool_timeout_s,
+        )
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            try:
+                async with self._inflight:
+                    response = await client.post(settings.flow_url, headers=headers, content=body, timeout=request_timeout)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as exc:
+                # Only retry failures where the flow never received the request; it is not idempotent.
+                if attempt >= settings.max_attempts:
+                    raise
+                delay = min(settings.retry_backoff_max_s, settings.retry_backoff_s * 2 ** (attempt - 1))
+                logger.warning("intelligence_studio.retry", session_id=session, attempt=attempt, delay_s=delay, error=repr(exc))
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            break
         latency_ms = int((time.perf_counter() - start) * 1000)
         logger.info("intelligence_studio.call", session_id=session, latency_ms=latency_ms, status_code=response.status_code)
         response.raise_for_status()
@@ -1,16 +1,18 @@
 """Token budgeting utilities and partitioning helpers."""
 from __future__ import annotations
 
-from copy import deepcopy
 from dataclasses import dataclass
+from functools import lru_cache
 from math import ceil
 from typing import Dict, Iterable, List, Sequence
 
+import numpy as np
+
 from ..config import get_settings
 from .types import EdgeSpec, NodeSpec
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetResult:
     """Summary of per-node token budgets."""
 
@@ -19,7 +21,7 @@ class BudgetResult:
     violations: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanBudgetingResult:
     """Container for updated plan graph and associated budget data."""
 
@@ -28,8 +30,13 @@ class PlanBudgetingResult:
     budget: BudgetResult
 
 
+def _tokens_for_word_count(word_count: int) -> int:
+    return max(32, int(word_count * 1.5) + 128)
+
+
+@lru_cache(maxsize=4096)
 def estimate_tokens(text: str) -> int:
-    return max(32, int(len(text.split()) * 1.5) + 128)
+    return _tokens_for_word_count(len(text.split()))
 
 
 def _estimate_node_budget(node: NodeSpec, floor: int) -> int:
@@ -39,58 +46,92 @@ def _estimate_node_budget(node: NodeSpec, floor: int) -> int:
     return max(estimate, floor)
 
 
+def _node_budgets(nodes: Sequence[NodeSpec], floor: int) -> list[int]:
+    """Vectorized ``_estimate_node_budget`` over a whole plan."""
+    count = len(nodes)
+    word_counts = np.fromiter((len(node.description.split()) for node in nodes), dtype=np.int64, count=count)
+    task_counts = np.fromiter((len(node.instructions.get("tasks", [])) for node in nodes), dtype=np.int64, count=count)
+    criteria_counts = np.fromiter((len(node.acceptance_criteria) for node in nodes), dtype=np.int64, count=count)
+    estimates = np.maximum(32, word_counts * 3 // 2 + 128) + task_counts * 40 + criteria_counts * 20
+    return np.maximum(estimates, floor).tolist()
+
+
 def _split_sequence(seq: Sequence[str], parts: int) -> list[list[str]]:
     if parts <= 0:
         return [[]]
-    total = len(seq)
-    base = total // parts
-    remainder = total % parts
-    result: list[list[str]] = []
-    index = 0
-    for i in range(parts):
-        size = base + (1 if i < remainder else 0)
-        if size <= 0:
-            result.append([])
-            continue
-        result.append(list(seq[index : index + size]))
-        index += size
-    while len(result) < parts:
-        result.append([])
-    return result
+    # The first ``remainder`` chunks take one extra item, so chunk i starts at i * base + min(i, remainder).
+    base, remainder = divmod(len(seq), parts)
+    bounds = [i * base + min(i, remainder) for i in range(parts + 1)]
+    return [list(seq[start:end]) for start, end in zip(bounds, bounds[1:])]
 
 
-def _fit_words_to_capacity(
-    words: Sequence[str],
+def _fit_word_count(
+    word_count: int,
     capacity: int,
     task_count: int,
     criteria_count: int,
     floor: int,
-) -> list[str]:
+) -> int:
+    """Return how many of ``word_count`` description words fit alongside the given tasks and criteria."""
     if capacity <= 0:
-        return []
-
-    def estimate_with_count(word_count: int) -> int:
-        desc_tokens = estimate_tokens(" ".join(words[:word_count])) if word_count else estimate_tokens("")
-        # estimate_tokens already includes baseline for the provided words.
-        total = desc_tokens + task_count * 40 + criteria_count * 20
-        return max(total, floor)
-
-    low, high = 0, len(words)
-    best: list[str] = []
-    while low <= high:
-        mid = (low + high) // 2
-        budget = estimate_with_count(mid)
-        if budget <= capacity:
-            best = list(words[:mid])
-            low = mid + 1
-        else:
-            high = mid - 1
-
-    return best
-
-
-def _partition_node(node: NodeSpec, capacity: int, floor: int) -> list[tuple[NodeSpec, int]]:
-    base_budget = _estimate_node_budget(node, floor)
+        return 0
+
+    # The estimate is max(floor, int(1.5 * w) + 128 + overhead) and monotone in w, so invert it
+    # directly: int(1.5 * w) <= slack holds exactly for w <= (2 * slack + 1) // 3.
+    slack = capacity - 128 - task_count * 40 - criteria_count * 20
+    if floor > capacity or slack < 0:
+        return 0
+    return min(word_count, (2 * slack + 1) // 3)
+
+
+def _min_even_part_count(
+    task_count: int,
+    criteria_count: int,
+    capacity: int,
+    floor: int,
+    min_parts: int,
+    max_parts: int,
+) -> int | None:
+    """Return the smallest part count in range whose even split fits within capacity.
+
+    Every part keeps at least one description word (the continuation note is never
+    empty), and the first part receives the largest share of both tasks and criteria,
+    so ``p`` parts fit exactly when that first part does.
+    """
+    if floor > capacity:
+        return None
+    item_capacity = capacity - _tokens_for_word_count(1)
+    if item_capacity < 0:
+        return None
+    load = task_count * 40 + criteria_count * 20
+    # No part can carry more than item_capacity, so fewer parts than this never fit.
+    start = max(min_parts, ceil(load / item_capacity) if item_capacity else min_parts)
+    for part_count in range(start, max_parts + 1):
+        if ceil(task_count / part_count) * 40 + ceil(criteria_count / part_count) * 20 <= item_capacity:
+            return part_count
+    return None
+
+
+def _part_node(node: NodeSpec, title: str, description: str, tasks: list[str], criteria: list[str]) -> NodeSpec:
+    """Derive one partition of ``node``; only the tasks differ from the parent's instructions."""
+    return NodeSpec(
+        domain=node.domain,
+        title=title,
+        description=description,
+        instructions={**node.instructions, "tasks": tasks},
+        acceptance_criteria=criteria,
+        artifacts_in=list(node.artifacts_in),
+        artifacts_out=list(node.artifacts_out),
+        contract_refs=list(node.contract_refs),
+        requirements_refs=list(node.requirements_refs),
+    )
+
+
+def _partition_node(
+    node: NodeSpec, capacity: int, floor: int, base_budget: int | None = None
+) -> list[tuple[NodeSpec, int]]:
+    if base_budget is None:
+        base_budget = _estimate_node_budget(node, floor)
     if base_budget <= capacity:
         return [(node, base_budget)]
 
@@ -109,107 +150,71 @@ def _partition_node(node: NodeSpec, capacity: int, floor: int) -> list[tuple[Nod
     )
     summary_words = desc_words[: min(len(desc_words), 40)] if desc_words else []
 
-    for part_count in range(required_parts, max_parts + 1):
+    part_count = _min_even_part_count(len(tasks), len(acceptance), capacity, floor, required_parts, max_parts)
+    if part_count is not None:
         desc_chunks = _split_sequence(desc_words, part_count)
         task_chunks = _split_sequence(tasks, part_count)
         criteria_chunks = _split_sequence(acceptance, part_count)
         partitions: list[tuple[NodeSpec, int]] = []
-        valid = True
         for idx in range(part_count):
-            part_tasks = list(task_chunks[idx])
-            part_criteria = list(criteria_chunks[idx])
-            note_words: list[str] = []
-            if part_count > 1:
-                note_words = (
-                    f"Subtask {idx + 1} of {part_count} continuing {node.title}."
-                ).split()
+            part_tasks = task_chunks[idx]
+            part_criteria = criteria_chunks[idx]
+            note_words = f"Subtask {idx + 1} of {part_count} continuing {node.title}.".split()
             base_words = desc_chunks[idx] if desc_chunks[idx] else summary_words
-            words_for_partition = list(base_words) + note_words
-            fitted_words = _fit_words_to_capacity(
-                words_for_partition,
-                capacity,
-                len(part_tasks),
-                len(part_criteria),
-                floor,
-            )
-            if not fitted_words and words_for_partition:
-                fitted_words = list(words_for_partition[:1])
-            description = " ".join(fitted_words).strip()
-            instructions = deepcopy(node.instructions)
-            instructions["tasks"] = part_tasks
-            part_node = NodeSpec(
-                domain=node.domain,
-                title=f"{node.title} (part {idx + 1} of {part_count})",
-                description=description,
-                instructions=instructions,
-                acceptance_criteria=part_criteria,
-                artifacts_in=deepcopy(node.artifacts_in),
-                artifacts_out=deepcopy(node.artifacts_out),
-                contract_refs=list(node.contract_refs),
-                requirements_refs=list(node.requirements_refs),
-            )
-            part_budget = _estimate_node_budget(part_node, floor)
-            if part_budget > capacity:
-                valid = False
-                break
-            partitions.append((part_node, part_budget))
-        if valid and partitions:
-            return partitions
-
-    # Final fallback: attempt a greedy assignment to ensure coverage.
+            word_count = len(base_words) + len(note_words)
+            fitted_count = max(1, _fit_word_count(word_count, capacity, len(part_tasks), len(part_criteria), floor))
+            # Words are whitespace-free tokens, so the budget follows from the counts alone.
+            part_budget = _estimate_budget_from_counts(fitted_count, len(part_tasks), len(part_criteria), floor)
+            description = " ".join((base_words + note_words)[:fitted_count])
+            title = f"{node.title} (part {idx + 1} of {part_count})"
+            partitions.append((_part_node(node, title, description, part_tasks, part_criteria), part_budget))
+        return partitions
+
+    # Final fallback: attempt a greedy assignment to ensure coverage. Cursors into the
+    # original sequences mark what has been assigned so far.
     partitions: list[tuple[NodeSpec, int]] = []
-    remaining_tasks = list(tasks)
-    remaining_criteria = list(acceptance)
-    remaining_words = list(desc_words)
+    task_pos = criteria_pos = word_pos = 0
     part_index = 0
-    while remaining_tasks or remaining_criteria or remaining_words:
+    while task_pos < len(tasks) or criteria_pos < len(acceptance) or word_pos < len(desc_words):
         part_index += 1
-        part_tasks: list[str] = []
-        part_criteria: list[str] = []
-        part_words: list[str] = []
+        task_start, criteria_start, word_start = task_pos, criteria_pos, word_pos
         changed = True
         while changed:
             changed = False
-            if remaining_tasks:
-                tentative_tasks = part_tasks + [remaining_tasks[0]]
-                budget = _estimate_budget_from_counts(len(part_words), len(tentative_tasks), len(part_criteria), floor)
+            if task_pos < len(tasks):
+                budget = _estimate_budget_from_counts(
+                    word_pos - word_start, task_pos - task_start + 1, criteria_pos - criteria_start, floor
+                )
                 if budget <= capacity:
-                    part_tasks.append(remaining_tasks.pop(0))
+                    task_pos += 1
                     changed = True
-            if remaining_criteria:
-                tentative_criteria = part_criteria + [remaining_criteria[0]]
-                budget = _estimate_budget_from_counts(len(part_words), len(part_tasks), len(tentative_criteria), floor)
+            if criteria_pos < len(acceptance):
+                budget = _estimate_budget_from_counts(
+                    word_pos - word_start, task_pos - task_start, criteria_pos - criteria_start + 1, floor
+                )
                 if budget <= capacity:
-                    part_criteria.append(remaining_criteria.pop(0))
+                    criteria_pos += 1
                     changed = True
-            if remaining_words:
-                tentative_words = part_words + [remaining_words[0]]
-                budget = _estimate_budget_from_counts(len(tentative_words), len(part_tasks), len(part_criteria), floor)
+            if word_pos < len(desc_words):
+                budget = _estimate_budget_from_counts(
+                    word_pos - word_start + 1, task_pos - task_start, criteria_pos - criteria_start, floor
+                )
                 if budget <= capacity:
-                    part_words.append(remaining_words.pop(0))
+                    word_pos += 1
                     changed = True
+        part_tasks = tasks[task_start:task_pos]
+        part_criteria = acceptance[criteria_start:criteria_pos]
+        part_words = desc_words[word_start:word_pos]
         if not (part_tasks or part_criteria or part_words):
             # Cannot assign more content without exceeding capacity; break to avoid infinite loop.
             break
-        instructions = deepcopy(node.instructions)
-        instructions["tasks"] = part_tasks
-        description_words = part_words if part_words else summary_words
         note = f"Subtask {part_index} of partition for {node.title}.".split()
-        description_words = list(description_words) + note
-        fitted = _fit_words_to_capacity(description_words, capacity, len(part_tasks), len(part_criteria), floor)
-        description = " ".join(fitted).strip()
-        part_node = NodeSpec(
-            domain=node.domain,
-            title=f"{node.title} (part {part_index})",
-            description=description,
-            instructions=instructions,
-            acceptance_criteria=part_criteria,
-            artifacts_in=deepcopy(node.artifacts_in),
-            artifacts_out=deepcopy(node.artifacts_out),
-            contract_refs=list(node.contract_refs),
-            requirements_refs=list(node.requirements_refs),
-        )
-        part_budget = _estimate_node_budget(part_node, floor)
+        description_words = (part_words or summary_words) + note
+        fitted_count = _fit_word_count(len(description_words), capacity, len(part_tasks), len(part_criteria), floor)
+        description = " ".join(description_words[:fitted_count])
+        part_budget = _estimate_budget_from_counts(fitted_count, len(part_tasks), len(part_criteria), floor)
+        title = f"{node.title} (part {part_index})"
+        part_node = _part_node(node, title, description, part_tasks, part_criteria)
         partitions.append((part_node, min(part_budget, capacity)))
 
     if not partitions:
@@ -218,8 +223,7 @@ def _partition_node(node: NodeSpec, capacity: int, floor: int) -> list[tuple[Nod
 
 
 def _estimate_budget_from_counts(word_count: int, task_count: int, criteria_count: int, floor: int) -> int:
-    dummy_text = " ".join(["token"] * word_count)
-    desc_tokens = estimate_tokens(dummy_text)
+    desc_tokens = _tokens_for_word_count(word_count)
     total = desc_tokens + task_count * 40 + criteria_count * 20
     return max(total, floor)
 
@@ -231,12 +235,14 @@ def _rewire_edges(
     new_nodes: Sequence[NodeSpec],
 ) -> list[EdgeSpec]:
     new_edges: list[EdgeSpec] = []
+    append = new_edges.append
+    lookup = mapping.get
     for edge in edges:
-        from_indices = mapping.get(edge.from_index)
-        to_indices = mapping.get(edge.to_index)
+        from_indices = lookup(edge.from_index)
+        to_indices = lookup(edge.to_index)
         if not from_indices or not to_indices:
             continue
-        new_edges.append(
+        append(
             EdgeSpec(
                 from_index=from_indices[-1],
                 to_index=to_indices[0],
@@ -248,15 +254,9 @@ def _rewire_edges(
     for original_index, new_indices in mapping.items():
         if len(new_indices) <= 1:
             continue
+        description = f"Partition order for {original_nodes[original_index].title}"
         for current, nxt in zip(new_indices, new_indices[1:]):
-            new_edges.append(
-                EdgeSpec(
-                    from_index=current,
-                    to_index=nxt,
-                    description=f"Partition order for {original_nodes[original_index].title}",
-                    artifact_type=None,
-                )
-            )
+            append(EdgeSpec(from_index=current, to_index=nxt, description=description, artifact_type=None))
 
     return new_edges
 
@@ -266,7 +266,11 @@ def plan_budgets(nodes: List[NodeSpec], edges: Sequence[EdgeSpec] | None = None)
     capacity = int(settings.tuning.default_model_window * (1 - settings.tuning.window_headroom_pct))
     token_floor = settings.tuning.token_budget_floor
 
-    partitions_per_node = [_partition_node(node, capacity, token_floor) for node in nodes]
+    base_budgets = _node_budgets(nodes, token_floor)
+    partitions_per_node = [
+        [(node, budget)] if budget <= capacity else _partition_node(node, capacity, token_floor, budget)
+        for node, budget in zip(nodes, base_budgets)
+    ]
 
     new_nodes: list[NodeSpec] = []
     budgets: list[int] = []
@@ -0,0 +1,246 @@
+"""Background batching of executor callbacks."""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from sqlalchemy import bindparam, cast, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..persistence.db import session_scope
+from ..persistence.models import ContextCard, Plan, PlanNode
+from .cards import ContextCardService
+
+logger = structlog.get_logger(__name__)
+
+_NODES = PlanNode.__table__
+
+
+@dataclass
+class CallbackEvent:
+    task_id: str
+    artifacts_out: list[dict[str, Any]] = field(default_factory=list)
+    citations: list[str] = field(default_factory=list)
+    card_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+
+class CallbackBatcher:
+    """Coalesce executor callbacks into one transaction per batch.
+
+    Events are drained until ``max_batch`` are pending or ``max_wait_s`` has
+    elapsed since the first one, then artifacts are appended with one
+    executemany UPDATE and context cards are written with one bulk INSERT.
+    Summaries are generated before the transaction opens. If the batch fails,
+    each event is retried in its own transaction. At most ``max_pending``
+    events wait in the queue; beyond that ``submit`` blocks.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 50,
+        max_wait_s: float = 0.05,
+        card_service: ContextCardService | None = None,
+        max_pending: int = 1000,
+    ) -> None:
+        self._max_batch = max_batch
+        self._max_wait_s = max_wait_s
+        self._card_service = card_service or ContextCardService()
+        self._max_pending = max_pending
+        self._queue: asyncio.Queue[CallbackEvent] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_worker(self) -> asyncio.Queue[CallbackEvent]:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(self, event: CallbackEvent) -> str:
+        """Queue an event and return the ID its context card will be stored under.
+
+        Waits while ``max_pending`` events are already queued.
+        """
+        await self._ensure_worker().put(event)
+        return event.card_id
+
+    async def join(self) -> None:
+        """Wait until every queued event has been flushed."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        await self.join()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self, queue: asyncio.Queue[CallbackEvent]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self._max_wait_s
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._persist(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _persist(self, batch: list[CallbackEvent]) -> None:
+        # Summaries come from the AI backend; generate them before any transaction so no
+        # connection or row lock is held across the round-trip, and replays never repeat it.
+        try:
+            summaries = await self._summarize(batch)
+        except Exception:
+            logger.exception("executor_callbacks.flush_failed", batch_size=len(batch))
+            return
+        events = [event for event in batch if event.card_id in summaries]
+        if not events:
+            return
+        try:
+            async with session_scope() as session:
+                await self._flush(session, events, summaries)
+            return
+        except Exception:
+            if len(events) == 1:
+                logger.exception("executor_callbacks.event_dropped", task_id=events[0].task_id)
+                return
+            logger.warning("executor_callbacks.flush_failed", batch_size=len(events), exc_info=True)
+        # Replay one event per transaction so a single bad event cannot sink the rest.
+        for event in events:
+            try:
+                async with session_scope() as session:
+                    await self._flush(session, [event], summaries)
+            except Exception:
+                logger.exception("executor_callbacks.event_dropped", task_id=event.task_id)
+
+    async def _select_nodes(self, session: AsyncSession, batch: list[CallbackEvent]) -> dict[str, Any]:
+        result = await session.execute(
+            select(
+                PlanNode.id,
+                PlanNode.plan_id,
+                PlanNode.label,
+                PlanNode.type,
+                PlanNode.instructions,
+                PlanNode.artifacts_out,
+                Plan.contract_hash,
+            )
+            .join(Plan, Plan.id == PlanNode.plan_id)
+            .where(PlanNode.id.in_({event.task_id for event in batch}))
+        )
+        return {row.id: row for row in result}
+
+    async def _summarize(self, batch: list[CallbackEvent]) -> dict[str, str]:
+        """Return summaries keyed by card ID; unknown tasks and failed summaries are dropped."""
+        async with session_scope() as session:
+            nodes = await self._select_nodes(session, batch)
+        events = [event for event in batch if event.task_id in nodes]
+        if len(events) < len(batch):
+            logger.warning("executor_callbacks.unknown_tasks", dropped=len(batch) - len(events))
+        results = await asyncio.gather(
+            *(
+                self._card_service.summarize(
+                    nodes[event.task_id],
+                    {
+                        "contractOps": nodes[event.task_id].instructions.get("contractOps", []),
+                        "planId": nodes[event.task_id].plan_id,
+                    },
+                )
+                for event in events
+            ),
+            return_exceptions=True,
+        )
+        summaries: dict[str, str] = {}
+        for event, result in zip(events, results):
+            if isinstance(result, BaseException):
+                logger.error("executor_callbacks.summary_failed", task_id=event.task_id, exc_info=result)
+            else:
+                summaries[event.card_id] = result
+        return summaries
+
+    async def _flush(self, session: AsyncSession, events: list[CallbackEvent], summaries: dict[str, str]) -> None:
+        nodes = await self._select_nodes(session, events)
+        events = [event for event in events if event.task_id in nodes]
+        if not events:
+            return
+        await self._append_artifacts(session, nodes, events)
+        cards = []
+        for event in events:
+            node = nodes[event.task_id]
+            cards.append(
+                {
+                    "id": event.card_id,
+                    "node_id": node.id,
+                    "contract_slice_ref": ",".join(node.instructions.get("contractOps", [])) or node.contract_hash,
+                    "interfaces": {"domain": node.type.value},
+                    "schema_hashes": {"contract": node.contract_hash},
+                    "summary": summaries[event.card_id],
+                    "citations": event.citations,
+                }
+            )
+        await session.execute(insert(ContextCard), cards)
+
+    async def _append_artifacts(self, session: AsyncSession, nodes: dict[str, Any], events: list[CallbackEvent]) -> None:
+        pending: dict[str, list[dict[str, Any]]] = {}
+        for event in events:
+            if event.artifacts_out:
+                pending.setdefault(event.task_id, []).extend(event.artifacts_out)
+        if not pending:
+            return
+        if session.bind.dialect.name == "postgresql":
+            current = func.coalesce(cast(_NODES.c.artifacts_out, JSONB), literal([], JSONB))
+            appended = current.op("||")(bindparam("new_artifacts", type_=JSONB))
+            stmt = (
+                update(_NODES)
+                .where(_NODES.c.id == bindparam("node_id"))
+                .values(artifacts_out=cast(appended, _NODES.c.artifacts_out.type))
+            )
+            params = [{"node_id": node_id, "new_artifacts": artifacts} for node_id, artifacts in pending.items()]
+        else:
+            # Other backends lack a JSON array concat operator; rewrite just this column.
+            stmt = update(_NODES).where(_NODES.c.id == bindparam("node_id")).values(artifacts_out=bindparam("merged"))
+            params = [
+                {"node_id": node_id, "merged": list(nodes[node_id].artifacts_out or []) + artifacts}
+                for node_id, artifacts in pending.items()
+            ]
+        await session.execute(stmt, params)
+
+
+_batcher_singleton: CallbackBatcher | None = None
+
+
+def get_callback_batcher() -> CallbackBatcher:
+    global _batcher_singleton
+    if _batcher_singleton is None:
+        _batcher_singleton = CallbackBatcher()
+    return _batcher_singleton
+
+
+async def close_callback_batcher() -> None:
+    global _batcher_singleton
+    if _batcher_singleton is not None:
+        await _batcher_singleton.close()
+        _batcher_singleton = None
+
+
+__all__ = ["CallbackBatcher", "CallbackEvent", "get_callback_batcher", "close_callback_batcher"]
@@ -1,15 +1,16 @@
 """Complexity scoring utilities."""
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
 from typing import Iterable, List
 
+import numpy as np
+
 from ..config import get_settings
 from .types import EdgeSpec, NodeSpec
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplexityBreakdown:
     node_index: int
     d: float
@@ -30,28 +31,35 @@ def _score_components(node: NodeSpec, in_degree: int, out_degree: int) -> tuple[
     s = min(1.0, (len(tasks) + len(node.acceptance_criteria)) / 8)
     n = min(1.0, len(set(tasks)) / 6 or 0.1)
     a = min(1.0, (len(contract_refs) + len(node.requirements_refs)) / 6)
-    r = 0.4 if any("research" in step.lower() for step in tasks) else 0.1
+    # "research" has no spaces, so it cannot match across the join boundary.
+    r = 0.4 if "research" in " ".join(tasks).lower() else 0.1
     return d, s, n, a, r
 
 
 def compute_complexity(nodes: List[NodeSpec], edges: Iterable[EdgeSpec]) -> list[ComplexityBreakdown]:
-    settings = get_settings()
-    in_degrees = [0] * len(nodes)
-    out_degrees = [0] * len(nodes)
-    for edge in edges:
-        out_degrees[edge.from_index] += 1
-        in_degrees[edge.to_index] += 1
+    tuning = get_settings().tuning
+    default_model_class = tuning.default_model_class
+    optional_model_class = tuning.optional_model_class
+    endpoints = np.array([(edge.from_index, edge.to_index) for edge in edges], dtype=np.int64).reshape(-1, 2)
+    out_degrees = np.bincount(endpoints[:, 0], minlength=len(nodes)).tolist()
+    in_degrees = np.bincount(endpoints[:, 1], minlength=len(nodes)).tolist()
+
+    components = np.array(
+        [_score_components(node, in_degrees[idx], out_degrees[idx]) for idx, node in enumerate(nodes)],
+        dtype=np.float64,
+    ).reshape(len(nodes), 5)
+    d_arr, s_arr, n_arr, a_arr, r_arr = components.T
+    # Same operand order as the scalar formula, so every node's score is bit-identical to it.
+    weighted = 0.30 * d_arr + 0.20 * s_arr + 0.20 * n_arr + 0.15 * a_arr + 0.15 * r_arr
+    scaled = (weighted * 100).tolist()
 
     breakdowns: list[ComplexityBreakdown] = []
-    for idx, node in enumerate(nodes):
-        d, s, n, a, r = _score_components(node, in_degrees[idx], out_degrees[idx])
-        weighted = 0.30 * d + 0.20 * s + 0.20 * n + 0.15 * a + 0.15 * r
-        ccs = round(weighted * 100, 2)
-        recommended = max(1, math.ceil(ccs / 15))
+    for idx, (d, s, n, a, r) in enumerate(components.tolist()):
+        ccs = round(scaled[idx], 2)
+        # ccs carries two decimals, so ceil(ccs / 15) is exact in integer hundredths.
+        recommended = max(1, (round(ccs * 100) + 1499) // 1500)
         confidence = max(0.5, round(1 - (ccs / 200), 2))
-        model_class = settings.tuning.default_model_class
-        if ccs >= 81 and settings.tuning.optional_model_class:
-            model_class = settings.tuning.optional_model_class
+        model_class = optional_model_class if ccs >= 81 and optional_model_class else default_model_class
         breakdowns.append(
             ComplexityBreakdown(
                 node_index=idx,
@@ -67,5 +75,3 @@ def compute_complexity(nodes: List[NodeSpec], edges: Iterable[EdgeSpec]) -> list
             )
         )
     return breakdowns
-
-
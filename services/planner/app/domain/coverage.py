@@ -4,20 +4,27 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable
 
-from .ingest import Operation
+from .ingest import ContractArtifact, Operation
 
 
-@dataclass
+@dataclass(slots=True)
 class CoverageResult:
     total_operations: int
     covered_operations: int
     missing_operations: list[str]
 
 
-def compute_coverage(operations: Iterable[Operation], covered_operation_ids: Iterable[str]) -> CoverageResult:
-    all_ops = {op.operation_id for op in operations}
-    covered = set(covered_operation_ids)
-    missing = sorted(all_ops - covered)
+def compute_coverage(
+    operations: ContractArtifact | Iterable[Operation], covered_operation_ids: Iterable[str]
+) -> CoverageResult:
+    """Compare contract operations against covered IDs; pass the contract itself to reuse its ID set."""
+    if isinstance(operations, ContractArtifact):
+        all_ops = operations.operation_ids
+    else:
+        all_ops = {op.operation_id for op in operations}
+    covered = covered_operation_ids if isinstance(covered_operation_ids, (set, frozenset)) else set(covered_operation_ids)
+    # Unordered; callers that render the list sort it themselves.
+    missing = list(all_ops - covered)
     return CoverageResult(
         total_operations=len(all_ops),
         covered_operations=len(all_ops) - len(missing),
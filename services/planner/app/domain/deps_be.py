@@ -4,11 +4,23 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Dict, List
 
-from .ingest import ContractArtifact
+from .ingest import ContractArtifact, memoize_by_contract
 from .types import NodeSpec
 from ..persistence.models import NodeDomain
 
+BE_TASKS = (
+    "Implement FastAPI route handlers aligned with contract",
+    "Integrate with database models and validations",
+    "Emit Context Cards upon completion",
+)
+BE_ACCEPTANCE = (
+    "All endpoints return contract-compliant schemas",
+    "Unit tests cover success and error paths",
+    "Token budget respected with context reuse",
+)
 
+
+@memoize_by_contract()
 def build_backend_nodes(contract: ContractArtifact) -> List[NodeSpec]:
     grouped: Dict[str, list] = defaultdict(list)
     for op in contract.operations:
@@ -18,29 +30,18 @@ def build_backend_nodes(contract: ContractArtifact) -> List[NodeSpec]:
     nodes: List[NodeSpec] = []
     for tag, ops in grouped.items():
         op_ids = [op.operation_id for op in ops]
+        contract_refs = [f"operation:{op_id}" for op_id in op_ids]
         title = f"Implement backend handlers for {tag}"
-        description = f"Implement API handlers covering operations: {', '.join(op_ids)}"
-        instructions = {
-            "contractOps": op_ids,
-            "tasks": [
-                "Implement FastAPI route handlers aligned with contract",
-                "Integrate with database models and validations",
-                "Emit Context Cards upon completion",
-            ],
-        }
-        acceptance = [
-            "All endpoints return contract-compliant schemas",
-            "Unit tests cover success and error paths",
-            "Token budget respected with context reuse",
-        ]
+        description = "Implement API handlers covering operations: " + ", ".join(op_ids)
+        instructions = {"contractOps": op_ids, "tasks": BE_TASKS}
         nodes.append(
             NodeSpec(
                 domain=NodeDomain.be,
                 title=title,
                 description=description,
                 instructions=instructions,
-                acceptance_criteria=acceptance,
-                contract_refs=[f"operation:{op_id}" for op_id in op_ids],
+                acceptance_criteria=BE_ACCEPTANCE,
+                contract_refs=contract_refs,
             )
         )
     return nodes
@@ -2,26 +2,27 @@
 from __future__ import annotations
 
 import json
+from dataclasses import asdict
 from typing import List
 
-from .ingest import ContractArtifact
+from .ingest import ContractArtifact, memoize_by_contract
 from .types import NodeSpec
 from ..persistence.models import NodeDomain
 
 
+@memoize_by_contract()
 def build_db_nodes(contract: ContractArtifact) -> List[NodeSpec]:
     nodes: List[NodeSpec] = []
     schemas = contract.schemas or {}
+    # Serialize each operation once; schemas are matched by substring against these blobs.
+    op_blobs = [(op.operation_id, json.dumps(asdict(op)).lower()) for op in contract.operations]
     for name, schema in schemas.items():
+        name_lower = name.lower()
         title = f"Design and migrate {name} table"
         description = f"Create migrations and data model for {name}."
         instructions = {
             "schemaDefinition": schema,
-            "contractOps": [
-                op.operation_id
-                for op in contract.operations
-                if name.lower() in json.dumps(op.__dict__).lower()
-            ],
+            "contractOps": [op_id for op_id, blob in op_blobs if name_lower in blob],
             "tasks": [
                 "Define table columns and constraints",
                 "Create migration scripts with reversible operations",
@@ -3,18 +3,34 @@ from __future__ import annotations
 
 from typing import List
 
-from .ingest import ContractArtifact
+from .ingest import ContractArtifact, memoize_by_contract
 from .types import NodeSpec
 from ..persistence.models import NodeDomain
 
 
-UI_BASE_TASKS = [
+UI_BASE_TASKS = (
     "Establish design system primitives",
     "Implement API client bound to contract schemas",
     "Ensure layout covers responsive breakpoints",
-]
-
-
+)
+UI_BASE_ACCEPTANCE = (
+    "Design tokens defined",
+    "API client generated from contract",
+    "Context card summarizing FE primitives emitted",
+)
+UI_FLOW_TASKS = (
+    "Create route + view",
+    "Integrate API client with optimistic states",
+    "Instrument analytics hooks",
+)
+UI_FLOW_ACCEPTANCE = (
+    "UI renders contract-backed data",
+    "Error and loading states covered",
+    "Accessibility checklist satisfied",
+)
+
+
+@memoize_by_contract()
 def build_frontend_nodes(contract: ContractArtifact) -> List[NodeSpec]:
     nodes: List[NodeSpec] = []
     if not contract.operations:
@@ -26,11 +42,7 @@ def build_frontend_nodes(contract: ContractArtifact) -> List[NodeSpec]:
             title="Create shared frontend foundation",
             description="Set up design system, routing shell, and API client",
             instructions={"tasks": UI_BASE_TASKS, "contractOps": [op.operation_id for op in contract.operations]},
-            acceptance_criteria=[
-                "Design tokens defined",
-                "API client generated from contract",
-                "Context card summarizing FE primitives emitted",
-            ],
+            acceptance_criteria=UI_BASE_ACCEPTANCE,
         )
     )
 
@@ -40,19 +52,8 @@ def build_frontend_nodes(contract: ContractArtifact) -> List[NodeSpec]:
                 domain=NodeDomain.fe,
                 title=f"Build UI flow for {op.operation_id}",
                 description=f"Implement UI to surface {op.summary or op.operation_id}",
-                instructions={
-                    "contractOps": [op.operation_id],
-                    "tasks": [
-                        "Create route + view",
-                        "Integrate API client with optimistic states",
-                        "Instrument analytics hooks",
-                    ],
-                },
-                acceptance_criteria=[
-                    "UI renders contract-backed data",
-                    "Error and loading states covered",
-                    "Accessibility checklist satisfied",
-                ],
+                instructions={"contractOps": [op.operation_id], "tasks": UI_FLOW_TASKS},
+                acceptance_criteria=UI_FLOW_ACCEPTANCE,
                 contract_refs=[f"operation:{op.operation_id}"],
             )
         )
@@ -1,16 +1,21 @@
 """PRD and contract ingestion utilities."""
 from __future__ import annotations
 
+import copy
+import functools
 import hashlib
+import itertools
 import json
 import re
-from dataclasses import dataclass
-from typing import Any
+import string
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
 
 from openapi_spec_validator import validate_spec
 
 
-@dataclass
+@dataclass(slots=True)
 class PRDArtifact:
     text: str
     headings: list[str]
@@ -19,7 +24,7 @@ class PRDArtifact:
     has_ui: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class Operation:
     path: str
     method: str
@@ -28,22 +33,37 @@ class Operation:
     tags: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractArtifact:
     raw: dict[str, Any]
     operations: list[Operation]
     schemas: dict[str, Any]
     hash: str
+    operation_ids: frozenset[str] = field(init=False)
 
+    def __post_init__(self) -> None:
+        self.operation_ids = frozenset(op.operation_id for op in self.operations)
 
-@dataclass
+
+@dataclass(slots=True)
 class IngestionResult:
     prd: PRDArtifact
     contract: ContractArtifact
 
 
-_UI_KEYWORDS = {"ui", "screen", "frontend", "interface", "page", "dashboard", "button", "form"}
-_GENERIC_HEADINGS = {
+_UI_KEYWORDS = frozenset({"ui", "screen", "frontend", "interface", "page", "dashboard", "button", "form"})
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+# Tokens are ASCII-only, so lowering just ASCII letters up front matches lowering each token.
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_CONSTRAINT_KEYWORDS = ("must", "shall", "should")
+# Plain alternations keep the historical substring semantics (e.g. "ui" inside "build"). The
+# classifier is a zero-width lookahead so overlapping keywords are all reported by one scan.
+_CONSTRAINT_PATTERN = "|".join(map(re.escape, _CONSTRAINT_KEYWORDS))
+_UI_PATTERN = "|".join(map(re.escape, sorted(_UI_KEYWORDS)))
+_CONSTRAINT_RE = re.compile(_CONSTRAINT_PATTERN)
+_UI_RE = re.compile(_UI_PATTERN)
+_CLASSIFIER_RE = re.compile(f"(?=(?P<constraint>{_CONSTRAINT_PATTERN})|(?P<ui>{_UI_PATTERN}))")
+_GENERIC_HEADINGS = frozenset({
     "overview",
     "introduction",
     "summary",
@@ -55,23 +75,29 @@ _GENERIC_HEADINGS = {
     "appendix",
     "future work",
     "out of scope",
-}
+})
 _DEFAULT_TAG = "Core"
 
 
 def parse_prd(text: str) -> PRDArtifact:
-    lines = text.splitlines()
     headings: list[str] = []
     glossary: list[str] = []
     constraints: list[str] = []
     has_ui = False
     glossary_section = False
 
-    for line in lines:
+    # Lowercase the document in one call and prefilter on it: keywords never span lines, so a
+    # keyword missing from the whole text cannot occur in any line and its per-line scan is skipped.
+    lowered_text = text.lower()
+    scan_constraints = _CONSTRAINT_RE.search(lowered_text) is not None
+    scan_ui = _UI_RE.search(lowered_text) is not None
+
+    for line, lowered_line in zip(text.splitlines(), lowered_text.splitlines()):
         stripped = line.strip()
         if not stripped:
             continue
-        if stripped.lower().startswith("glossary"):
+        lowered = lowered_line.strip()
+        if lowered.startswith("glossary"):
             glossary_section = True
             continue
         if stripped.startswith("#"):
@@ -80,10 +106,19 @@ def parse_prd(text: str) -> PRDArtifact:
             glossary_section = False
         if glossary_section and ":" in stripped:
             glossary.append(stripped)
-        if any(keyword in stripped.lower() for keyword in ("must", "shall", "should")):
+        if not scan_ui or has_ui:
+            is_constraint = scan_constraints and _CONSTRAINT_RE.search(lowered) is not None
+        else:
+            is_constraint = False
+            for match in _CLASSIFIER_RE.finditer(lowered):
+                if match.group("constraint"):
+                    is_constraint = True
+                else:
+                    has_ui = True
+                if is_constraint and has_ui:
+                    break
+        if is_constraint:
             constraints.append(stripped)
-        if any(keyword in stripped.lower() for keyword in _UI_KEYWORDS):
-            has_ui = True
 
     return PRDArtifact(text=text, headings=headings, glossary=glossary, constraints=constraints, has_ui=has_ui)
 
@@ -101,22 +136,94 @@ def _extract_operations(openapi: dict[str, Any]) -> list[Operation]:
     return operations
 
 
-def load_contract(document: dict[str, Any]) -> ContractArtifact:
-    validate_spec(document)
+def load_contract(document: dict[str, Any], validate: bool = True) -> ContractArtifact:
+    """Parse ``document``; ``validate=False`` is for contracts we built or already validated."""
+    if validate:
+        validate_spec(document)
     operations = _extract_operations(document)
     schemas = document.get("components", {}).get("schemas", {})
-    digest = hashlib.sha256(json.dumps(document, sort_keys=True).encode("utf-8")).hexdigest()
-    return ContractArtifact(raw=document, operations=operations, schemas=schemas, hash=digest)
+    return ContractArtifact(raw=document, operations=operations, schemas=schemas, hash=_contract_digest(document))
+
+
+
+_STORED_CONTRACTS_SIZE = 128
+_stored_contracts: OrderedDict[str, ContractArtifact] = OrderedDict()
+
+
+def remember_contract(contract: ContractArtifact) -> None:
+    """Keep the parsed form of a contract held in artifact storage, keyed by its hash."""
+    _stored_contracts[contract.hash] = contract
+    _stored_contracts.move_to_end(contract.hash)
+    if len(_stored_contracts) > _STORED_CONTRACTS_SIZE:
+        _stored_contracts.popitem(last=False)
+
+
+def recall_contract(contract_hash: str) -> ContractArtifact | None:
+    """Return a contract passed to ``remember_contract``, or ``None`` once it has been evicted."""
+    contract = _stored_contracts.get(contract_hash)
+    if contract is not None:
+        _stored_contracts.move_to_end(contract_hash)
+    return contract
+
+
+_HASH_ENCODER = json.JSONEncoder(sort_keys=True)
+
+
+_T = TypeVar("_T")
+_ContractBuilder = Callable[[ContractArtifact], list[_T]]
+
+
+def memoize_by_contract(maxsize: int = 32) -> Callable[[_ContractBuilder[_T]], _ContractBuilder[_T]]:
+    """Cache a deterministic per-contract builder under ``contract.hash``.
+
+    Hits return fresh shallow copies of the cached items, so callers may rebind
+    fields on what they receive; nested containers are shared and must not be
+    mutated in place. The wrapper exposes ``cache_clear()`` for tests.
+    """
+
+    def decorator(build: _ContractBuilder[_T]) -> _ContractBuilder[_T]:
+        cache: OrderedDict[str, tuple[_T, ...]] = OrderedDict()
+
+        @functools.wraps(build)
+        def wrapper(contract: ContractArtifact) -> list[_T]:
+            items = cache.get(contract.hash)
+            if items is None:
+                items = tuple(build(contract))
+                cache[contract.hash] = items
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(contract.hash)
+            return [copy.copy(item) for item in items]
+
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def _contract_digest(document: dict[str, Any]) -> str:
+    """SHA-256 of ``json.dumps(document, sort_keys=True)``.
+
+    ``encode`` takes the C encoder's one-shot path; ``iterencode`` falls back to the
+    pure-Python encoder and measured ~5x slower, which outweighs holding one transient
+    copy of the document. The byte format must stay fixed: the digest is persisted as
+    ``Plan.contract_hash`` and handed to executors in context cards.
+    """
+    return hashlib.sha256(_HASH_ENCODER.encode(document).encode("utf-8")).hexdigest()
 
 
 def ingest(prd_text: str, contract_document: dict[str, Any] | None = None) -> IngestionResult:
     prd = parse_prd(prd_text)
-    document = contract_document or synthesize_contract(prd)
-    contract = load_contract(document)
+    if contract_document:
+        contract = load_contract(contract_document)
+    else:
+        # The synthesizer emits a fixed, known-valid OpenAPI shape; skip the jsonschema walk.
+        contract = load_contract(synthesize_contract(prd), validate=False)
     return IngestionResult(prd=prd, contract=contract)
 
 
-@dataclass
+@dataclass(slots=True)
 class _EntitySpec:
     display: str
     plural_display: str
@@ -193,6 +300,9 @@ def _derive_entities(prd: PRDArtifact, tags: list[str]) -> list[_EntitySpec]:
     used_path_segments: set[str] = set()
     seen_keys: set[str] = set()
 
+    lowered_constraints = [(line, line.lower()) for line in prd.constraints]
+    tag_tokens = [(tag, _token_set(tag)) for tag in tags]
+
     def _register_entity(name: str, description: str) -> None:
         display = _normalize_display(name)
         key = display.lower()
@@ -204,8 +314,8 @@ def _derive_entities(prd: PRDArtifact, tags: list[str]) -> list[_EntitySpec]:
         schema_name = _unique_name(_to_pascal(display), used_schema_names)
         path_segment = _unique_slug(_to_slug(plural_display), used_path_segments)
         param_name = f"{_to_camel(display)}Id"
-        tag = _choose_tag(display, tags)
-        constraints = _collect_constraints(prd.constraints, display, plural_display)
+        tag = _choose_tag(display, tag_tokens)
+        constraints = _collect_constraints(lowered_constraints, display, plural_display)
 
         entities.append(
             _EntitySpec(
@@ -242,20 +352,23 @@ def _derive_entities(prd: PRDArtifact, tags: list[str]) -> list[_EntitySpec]:
 def _distribute_remaining_constraints(constraints: list[str], entities: list[_EntitySpec]) -> None:
     if not constraints or not entities:
         return
-    captured: set[str] = {constraint for entity in entities for constraint in entity.constraints}
-    remaining = [line for line in constraints if line not in captured]
-    if not remaining:
-        return
-    targets = [entity for entity in entities if not entity.constraints] or entities
-    max_assignments = len(targets) * 2
+    # One pass over the entities collects both the captured lines and the unconstrained targets.
+    captured: set[str] = set()
+    targets: list[_EntitySpec] = []
+    for entity in entities:
+        if entity.constraints:
+            captured.update(entity.constraints)
+        else:
+            targets.append(entity)
+    targets = targets or entities
+    # Only the first two lines per target are ever assigned, so stop filtering there.
+    remaining = itertools.islice((line for line in constraints if line not in captured), len(targets) * 2)
     for idx, line in enumerate(remaining):
-        if idx >= max_assignments:
-            break
         targets[idx % len(targets)].constraints.append(line)
 
 
 def _normalize_display(text: str) -> str:
-    parts = re.findall(r"[A-Za-z0-9]+", text)
+    parts = _TOKEN_RE.findall(text)
     if not parts:
         return ""
     return " ".join(part.capitalize() for part in parts)
@@ -276,18 +389,21 @@ def _pluralize_display(display: str) -> str:
     return " ".join(parts[:-1] + [plural_last])
 
 
+@functools.lru_cache(maxsize=512)
 def _to_pascal(text: str) -> str:
-    parts = re.findall(r"[A-Za-z0-9]+", text)
+    parts = _TOKEN_RE.findall(text)
     if not parts:
         return "Resource"
     return "".join(part.capitalize() for part in parts)
 
 
+@functools.lru_cache(maxsize=512)
 def _to_slug(text: str) -> str:
-    parts = re.findall(r"[A-Za-z0-9]+", text.lower())
+    parts = _TOKEN_RE.findall(text.lower())
     return "-".join(parts) or "resource"
 
 
+@functools.lru_cache(maxsize=512)
 def _to_camel(text: str) -> str:
     pascal = _to_pascal(text)
     if not pascal:
@@ -317,32 +433,41 @@ def _unique_slug(value: str, used: set[str]) -> str:
     return candidate
 
 
-def _choose_tag(display: str, tags: list[str]) -> str:
-    if not tags:
+def _token_set(text: str) -> frozenset[str]:
+    """Lowercased identifier tokens of ``text``."""
+    return frozenset(_TOKEN_RE.findall(text.translate(_ASCII_LOWER)))
+
+
+def _choose_tag(display: str, tag_tokens: list[tuple[str, frozenset[str]]]) -> str:
+    """Pick the first tag sharing a token with ``display``; ``tag_tokens`` is built once per PRD."""
+    if not tag_tokens:
         return _DEFAULT_TAG
-    display_tokens = {token.lower() for token in re.findall(r"[A-Za-z0-9]+", display) if token}
-    for tag in tags:
-        tag_tokens = {token.lower() for token in re.findall(r"[A-Za-z0-9]+", tag) if token}
-        if display_tokens & tag_tokens:
+    display_tokens = _token_set(display)
+    for tag, tokens in tag_tokens:
+        if not display_tokens.isdisjoint(tokens):
             return tag
-    return tags[0]
+    return tag_tokens[0][0]
 
 
-def _collect_constraints(constraints: list[str], display: str, plural_display: str) -> list[str]:
+def _collect_constraints(constraints: list[tuple[str, str]], display: str, plural_display: str) -> list[str]:
+    """Return up to four ``(line, lowered)`` constraints mentioning the entity or one of its tokens."""
     if not constraints:
         return []
     names = {display.lower(), plural_display.lower()}
     tokens = {
         token
-        for token in re.findall(r"[A-Za-z0-9]+", f"{display} {plural_display}".lower())
+        for token in _TOKEN_RE.findall(f"{display} {plural_display}".lower())
         if len(token) >= 3
     }
+    # One alternation keeps the substring semantics of testing each needle with ``in``.
+    needles = re.compile("|".join(re.escape(needle) for needle in sorted(names | tokens)))
     collected: list[str] = []
-    for line in constraints:
-        lowered = line.lower()
-        if any(name in lowered for name in names) or any(token in lowered for token in tokens):
+    for line, lowered in constraints:
+        if needles.search(lowered):
             collected.append(line)
-    return collected[:4]
+            if len(collected) == 4:
+                break
+    return collected
 
 
 def _compose_info_description(prd: PRDArtifact, entities: list[_EntitySpec]) -> str:
@@ -395,26 +520,26 @@ def _add_entity_operations(paths: dict[str, Any], entity: _EntitySpec, operation
     base_path = f"/{entity.path_segment}"
     item_path = f"{base_path}/{{{entity.param_name}}}"
 
-    paths.setdefault(base_path, {})
-    paths.setdefault(item_path, {})
+    # Operations share these sub-objects by reference; the contract is only ever serialized.
+    description = _operation_description(entity)
+    constraints = _constraint_extension(description)
+    parameters = [_build_path_parameter(entity)]
+    schema_ref = {"$ref": f"#/components/schemas/{entity.schema_name}"}
+    json_schema = {"application/json": {"schema": schema_ref}}
+    json_body = {"required": True, "content": json_schema}
+    not_found = {"description": f"{entity.display} not found"}
 
     list_op = _build_operation(
         operation_ids,
         f"list{entity.operation_plural}",
         summary=f"List {entity.plural_display}",
-        description=_operation_description(entity),
+        description=description,
+        constraints=constraints,
         tag=entity.tag,
         responses={
             "200": {
                 "description": f"List of {entity.plural_display}",
-                "content": {
-                    "application/json": {
-                        "schema": {
-                            "type": "array",
-                            "items": {"$ref": f"#/components/schemas/{entity.schema_name}"},
-                        }
-                    }
-                },
+                "content": {"application/json": {"schema": {"type": "array", "items": schema_ref}}},
             }
         },
     )
@@ -423,45 +548,24 @@ def _add_entity_operations(paths: dict[str, Any], entity: _EntitySpec, operation
         operation_ids,
         f"create{entity.operation_singular}",
         summary=f"Create {entity.display}",
-        description=_operation_description(entity),
+        description=description,
+        constraints=constraints,
         tag=entity.tag,
-        request_body={
-            "required": True,
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity.schema_name}"}
-                }
-            },
-        },
-        responses={
-            "201": {
-                "description": f"Created {entity.display}",
-                "content": {
-                    "application/json": {
-                        "schema": {"$ref": f"#/components/schemas/{entity.schema_name}"}
-                    }
-                },
-            }
-        },
+        request_body=json_body,
+        responses={"201": {"description": f"Created {entity.display}", "content": json_schema}},
     )
 
     get_op = _build_operation(
         operation_ids,
         f"get{entity.operation_singular}",
         summary=f"Get {entity.display}",
-        description=_operation_description(entity),
+        description=description,
+        constraints=constraints,
         tag=entity.tag,
-        parameters=[_build_path_parameter(entity)],
+        parameters=parameters,
         responses={
-            "200": {
-                "description": f"{entity.display} details",
-                "content": {
-                    "application/json": {
-                        "schema": {"$ref": f"#/components/schemas/{entity.schema_name}"}
-                    }
-                },
-            },
-            "404": {"description": f"{entity.display} not found"},
+            "200": {"description": f"{entity.display} details", "content": json_schema},
+            "404": not_found,
         },
     )
 
@@ -469,34 +573,20 @@ def _add_entity_operations(paths: dict[str, Any], entity: _EntitySpec, operation
         operation_ids,
         f"update{entity.operation_singular}",
         summary=f"Update {entity.display}",
-        description=_operation_description(entity),
+        description=description,
+        constraints=constraints,
         tag=entity.tag,
-        parameters=[_build_path_parameter(entity)],
-        request_body={
-            "required": True,
-            "content": {
-                "application/json": {
-                    "schema": {"$ref": f"#/components/schemas/{entity.schema_name}"}
-                }
-            },
-        },
+        parameters=parameters,
+        request_body=json_body,
         responses={
-            "200": {
-                "description": f"Updated {entity.display}",
-                "content": {
-                    "application/json": {
-                        "schema": {"$ref": f"#/components/schemas/{entity.schema_name}"}
-                    }
-                },
-            },
-            "404": {"description": f"{entity.display} not found"},
+            "200": {"description": f"Updated {entity.display}", "content": json_schema},
+            "404": not_found,
         },
     )
 
-    paths[base_path]["get"] = list_op
-    paths[base_path]["post"] = create_op
-    paths[item_path]["get"] = get_op
-    paths[item_path]["patch"] = update_op
+    # Path segments are unique per entity, so each entity owns both of its path items outright.
+    paths[base_path] = {"get": list_op, "post": create_op}
+    paths[item_path] = {"get": get_op, "patch": update_op}
 
 
 def _build_operation(
@@ -505,6 +595,7 @@ def _build_operation(
     *,
     summary: str,
     description: str,
+    constraints: list[str] | None,
     tag: str,
     responses: dict[str, Any],
     parameters: list[dict[str, Any]] | None = None,
@@ -523,14 +614,18 @@ def _build_operation(
         operation["parameters"] = parameters
     if request_body:
         operation["requestBody"] = request_body
-    constraint_extension: list[str] | None = None
-    if "Key constraints:" in description:
-        constraint_extension = [line.strip("- ") for line in description.splitlines() if line.strip().startswith("-")]
-    if constraint_extension:
-        operation["x-prd-constraints"] = constraint_extension
+    if constraints:
+        operation["x-prd-constraints"] = constraints
     return operation
 
 
+def _constraint_extension(description: str) -> list[str] | None:
+    """Bullet lines of an operation description that lists key constraints."""
+    if "Key constraints:" not in description:
+        return None
+    return [line.strip("- ") for line in description.splitlines() if line.strip().startswith("-")]
+
+
 def _unique_operation_id(operation_id: str, used: set[str]) -> str:
     base = operation_id
     candidate = base
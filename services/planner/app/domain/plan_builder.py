@@ -10,6 +10,37 @@ from .deps_fe import build_frontend_nodes
 from .ingest import IngestionResult
 from .types import EdgeSpec, NodeSpec, PlanBuildResult
 
+REPO_TASKS = (
+    "Provision repository with FastAPI service skeleton",
+    "Set up infrastructure IaC directories",
+    "Bootstrap Alembic migrations and Dockerfiles",
+)
+REPO_ACCEPTANCE = (
+    "Repository skeleton ready with FastAPI app",
+    "Continuous integration pipeline stub available",
+    "Secrets placeholders documented",
+)
+TEST_TASKS = (
+    "Generate contract conformance tests",
+    "Create end-to-end scenarios across domains",
+    "Produce coverage diff artifact",
+)
+TEST_ACCEPTANCE = (
+    "100% contract operations exercised",
+    "Regression matrix documented",
+    "Test artifacts stored with hash references",
+)
+PACKAGE_TASKS = (
+    "Produce Helm values and Terraform diffs",
+    "Update OTEL + metrics dashboards",
+    "Document release readiness and runbooks",
+)
+PACKAGE_ACCEPTANCE = (
+    "Deployment artifacts content-hashed and stored",
+    "Operational readiness checklist signed",
+    "Audit log entry generated with correlation ID",
+)
+
 
 def build_plan(ingestion: IngestionResult) -> PlanBuildResult:
     nodes: List[NodeSpec] = []
@@ -21,18 +52,10 @@ def build_plan(ingestion: IngestionResult) -> PlanBuildResult:
         title="Request: provision repository scaffold",
         description="Request infra to prepare Git repository scaffold with CI/CD hooks and base directories.",
         instructions={
-            "tasks": [
-                "Provision repository with FastAPI service skeleton",
-                "Set up infrastructure IaC directories",
-                "Bootstrap Alembic migrations and Dockerfiles",
-            ],
+            "tasks": REPO_TASKS,
             "contractOps": [],
         },
-        acceptance_criteria=[
-            "Repository skeleton ready with FastAPI app",
-            "Continuous integration pipeline stub available",
-            "Secrets placeholders documented",
-        ],
+        acceptance_criteria=REPO_ACCEPTANCE,
         artifacts_out=[{"type": "repo-scaffold", "description": "Repository template request"}],
     )
     nodes.append(repo_node)
@@ -42,25 +65,30 @@ def build_plan(ingestion: IngestionResult) -> PlanBuildResult:
     db_start = len(nodes)
     nodes.extend(db_nodes)
 
-    for offset in range(len(db_nodes)):
-        edges.append(EdgeSpec(from_index=repo_idx, to_index=db_start + offset, description="Repo ready"))
+    db_range = range(db_start, db_start + len(db_nodes))
+    edges.extend(EdgeSpec(from_index=repo_idx, to_index=db_idx, description="Repo ready") for db_idx in db_range)
 
     backend_nodes = build_backend_nodes(ingestion.contract)
     be_start = len(nodes)
     nodes.extend(backend_nodes)
 
-    for offset in range(len(backend_nodes)):
-        for db_idx in range(db_start, db_start + len(db_nodes)):
-            edges.append(EdgeSpec(from_index=db_idx, to_index=be_start + offset, description="DB schema available"))
+    be_range = range(be_start, be_start + len(backend_nodes))
+    edges.extend(
+        EdgeSpec(from_index=db_idx, to_index=be_idx, description="DB schema available")
+        for be_idx in be_range
+        for db_idx in db_range
+    )
 
     fe_nodes: List[NodeSpec] = []
     if ingestion.prd.has_ui:
         fe_nodes = build_frontend_nodes(ingestion.contract)
         fe_start = len(nodes)
         nodes.extend(fe_nodes)
-        for offset in range(len(fe_nodes)):
-            for be_idx in range(be_start, be_start + len(backend_nodes)):
-                edges.append(EdgeSpec(from_index=be_idx, to_index=fe_start + offset, description="API ready"))
+        edges.extend(
+            EdgeSpec(from_index=be_idx, to_index=fe_idx, description="API ready")
+            for fe_idx in range(fe_start, fe_start + len(fe_nodes))
+            for be_idx in be_range
+        )
     else:
         fe_start = len(nodes)
 
@@ -69,47 +97,30 @@ def build_plan(ingestion: IngestionResult) -> PlanBuildResult:
         title="Construct integration and contract tests",
         description="Author integration tests ensuring API and data contract coverage with regression hooks.",
         instructions={
-            "tasks": [
-                "Generate contract conformance tests",
-                "Create end-to-end scenarios across domains",
-                "Produce coverage diff artifact",
-            ],
+            "tasks": TEST_TASKS,
             "contractOps": [op.operation_id for op in ingestion.contract.operations],
         },
-        acceptance_criteria=[
-            "100% contract operations exercised",
-            "Regression matrix documented",
-            "Test artifacts stored with hash references",
-        ],
+        acceptance_criteria=TEST_ACCEPTANCE,
     )
     test_idx = len(nodes)
     nodes.append(test_node)
 
-    for be_idx in range(be_start, be_start + len(backend_nodes)):
-        edges.append(EdgeSpec(from_index=be_idx, to_index=test_idx, description="Backend complete"))
-    if fe_nodes:
-        for fe_idx in range(fe_start, fe_start + len(fe_nodes)):
-            edges.append(EdgeSpec(from_index=fe_idx, to_index=test_idx, description="UI ready"))
-    for db_idx in range(db_start, db_start + len(db_nodes)):
-        edges.append(EdgeSpec(from_index=db_idx, to_index=test_idx, description="DB migrations ready"))
+    edges.extend(EdgeSpec(from_index=be_idx, to_index=test_idx, description="Backend complete") for be_idx in be_range)
+    edges.extend(
+        EdgeSpec(from_index=fe_idx, to_index=test_idx, description="UI ready")
+        for fe_idx in range(fe_start, fe_start + len(fe_nodes))
+    )
+    edges.extend(EdgeSpec(from_index=db_idx, to_index=test_idx, description="DB migrations ready") for db_idx in db_range)
 
     package_node = NodeSpec(
         domain=NodeDomain.package,
         title="Finalize deployment package",
         description="Assemble deployment manifests, Helm chart updates, and release plan with rollback procedures.",
         instructions={
-            "tasks": [
-                "Produce Helm values and Terraform diffs",
-                "Update OTEL + metrics dashboards",
-                "Document release readiness and runbooks",
-            ],
+            "tasks": PACKAGE_TASKS,
             "contractOps": [],
         },
-        acceptance_criteria=[
-            "Deployment artifacts content-hashed and stored",
-            "Operational readiness checklist signed",
-            "Audit log entry generated with correlation ID",
-        ],
+        acceptance_criteria=PACKAGE_ACCEPTANCE,
     )
     package_idx = len(nodes)
     nodes.append(package_node)
@@ -2,25 +2,26 @@
 from __future__ import annotations
 
 import time
+import uuid
 from dataclasses import dataclass
 from typing import Any, Iterable
 
-from sqlalchemy import select
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..persistence.models import AuditLog, ComplexityFeatures, Plan, PlanCandidate, PlanEdge, PlanNode, PlanStatus
-from ..persistence.storage import ArtifactStorage
+from ..persistence.storage import ArtifactStorage, get_artifact_storage
 from .budget import BudgetResult, PlanBudgetingResult, plan_budgets
 from .ccs import ComplexityBreakdown, compute_complexity
 from .coverage import compute_coverage
-from .ingest import ingest
+from .ingest import ingest, remember_contract
 from .plan_builder import build_plan
 from .report import build_plan_report
 from .types import PlanBuildResult
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanCreateParams:
     project_id: str
     run_id: str
@@ -32,23 +33,30 @@ class PlanCreateParams:
 
 
 class PlannerOrchestrator:
-    def __init__(self, session: AsyncSession) -> None:
-        self._session = session
-        self._storage = ArtifactStorage()
+    """Stateless plan builder; the DB session is supplied per call."""
+
+    def __init__(self, storage: ArtifactStorage | None = None) -> None:
+        self._storage = storage or get_artifact_storage()
         self._settings = get_settings()
 
-    async def create_plan(self, params: PlanCreateParams) -> Plan:
+    async def create_plan(self, session: AsyncSession, params: PlanCreateParams) -> Plan:
         start = time.perf_counter()
+        tuning = self._settings.tuning
         ingestion = ingest(params.prd_text, params.contract_document)
         build = build_plan(ingestion)
         budgeting: PlanBudgetingResult = plan_budgets(build.nodes, build.edges)
         build = PlanBuildResult(nodes=budgeting.nodes, edges=budgeting.edges)
         budget = budgeting.budget
         complexities = compute_complexity(build.nodes, build.edges)
-        covered_ops = [op_id for node in build.nodes for op_id in node.instructions.get("contractOps", [])]
-        coverage = compute_coverage(ingestion.contract.operations, covered_ops)
+        # A set is what compute_coverage works on, so build it directly rather than via a list.
+        covered_ops = {op_id for node in build.nodes for op_id in node.instructions.get("contractOps", ())}
+        coverage = compute_coverage(ingestion.contract, covered_ops)
         if coverage.missing_operations:
-            raise ValueError(f"Missing contract coverage: {coverage.missing_operations}")
+            raise ValueError(f"Missing contract coverage: {sorted(coverage.missing_operations)}")
+        # The contract can be large; keep it in content-addressed storage, not in the plan row.
+        contract_ref = await self._storage.put_json(ingestion.contract.raw)
+        # Plan summaries read the contract back by hash; hand them the parsed copy we already have.
+        remember_contract(ingestion.contract)
 
         plan = Plan(
             project_id=params.project_id,
@@ -59,120 +67,164 @@ class PlannerOrchestrator:
             wall_time_ms=int((time.perf_counter() - start) * 1000),
             token_cost=sum(budget.budgets),
             params={
-                "headroomPct": self._settings.tuning.window_headroom_pct,
-                "allowResearch": self._settings.tuning.allow_research,
+                "headroomPct": tuning.window_headroom_pct,
+                "allowResearch": tuning.allow_research,
                 "contractOperations": len(ingestion.contract.operations),
                 "ingest": {
                     "prdText": params.prd_text,
-                    "contract": ingestion.contract.raw,
+                    "contractRef": contract_ref,
+                    "contractHash": ingestion.contract.hash,
                     "contractSource": "provided" if params.contract_document is not None else "synthesized",
                 },
                 "requestOptions": params.options or {},
             },
         )
-        self._session.add(plan)
-        await self._session.flush()
-
-        await self._persist_nodes(plan, build, budget, complexities)
-        await self._persist_edges(plan, build)
-        await self._persist_candidates(plan, len(build.nodes))
-        await self._persist_audit(plan, params)
-
-        nodes_result = await self._session.execute(
-            select(PlanNode).where(PlanNode.plan_id == plan.id).order_by(PlanNode.order_hint)
+        session.add(plan)
+        await session.flush()
+
+        node_ids = await self._persist_nodes(session, plan, build, budget, complexities)
+        await self._persist_edges(session, plan, build, node_ids)
+        await self._persist_candidates(session, plan, len(build.nodes))
+        await self._persist_audit(session, plan, params)
+
+        # The report only needs each node's domain, which the build already has; reloading the
+        # inserted rows as ORM objects would just re-parse their JSON columns.
+        report = build_plan_report(
+            plan,
+            (node.domain for node in build.nodes),
+            coverage,
+            budget,
+            complexities,
+            candidate_count=3,
+            headroom_pct=tuning.window_headroom_pct,
         )
-        nodes = nodes_result.scalars().all()
-        report = build_plan_report(plan, nodes, coverage, budget, complexities, candidate_count=3)
         plan.report_ref = await self._storage.put_json(report)
 
         return plan
 
     async def _persist_nodes(
         self,
+        session: AsyncSession,
         plan: Plan,
         build: PlanBuildResult,
         budget: BudgetResult,
         complexities: Iterable[ComplexityBreakdown],
-    ) -> None:
+    ) -> list[str]:
+        """Bulk-insert nodes with their complexity rows and return node IDs in build order."""
         complexity_lookup = {c.node_index: c for c in complexities}
+        node_rows: list[dict[str, Any]] = []
+        feature_rows: list[dict[str, Any]] = []
+        node_ids: list[str] = []
         for idx, node_spec in enumerate(build.nodes):
             breakdown = complexity_lookup[idx]
-            plan_node = PlanNode(
-                plan_id=plan.id,
-                type=node_spec.domain,
-                label=node_spec.title,
-                instructions={**node_spec.instructions, "acceptanceCriteria": node_spec.acceptance_criteria},
-                artifacts_in=node_spec.artifacts_in,
-                artifacts_out=node_spec.artifacts_out,
-                token_budget=budget.budgets[idx],
-                score={
-                    "ccs": breakdown.ccs,
-                    "score_1_10": round(breakdown.ccs / 10, 1),
-                    "components": {
-                        "d": breakdown.d,
-                        "s": breakdown.s,
-                        "n": breakdown.n,
-                        "a": breakdown.a,
-                        "r": breakdown.r,
+            # Keys are assigned client-side, so features and edges can reference them without
+            # reading anything back from the INSERT.
+            node_id = str(uuid.uuid4())
+            node_ids.append(node_id)
+            node_rows.append(
+                {
+                    "id": node_id,
+                    "plan_id": plan.id,
+                    "type": node_spec.domain,
+                    "label": node_spec.title,
+                    # Builders share immutable task/criteria tuples; rows get their own lists.
+                    "instructions": {
+                        **node_spec.instructions,
+                        "tasks": list(node_spec.instructions.get("tasks", ())),
+                        "acceptanceCriteria": list(node_spec.acceptance_criteria),
                     },
-                    "recommendedSubtasks": breakdown.recommended_subtasks,
-                    "confidence": breakdown.confidence,
-                    "modelClass": breakdown.model_class,
-                },
-                order_hint=idx,
-                summary=node_spec.description,
+                    "artifacts_in": node_spec.artifacts_in,
+                    "artifacts_out": node_spec.artifacts_out,
+                    "token_budget": budget.budgets[idx],
+                    "score": {
+                        "ccs": breakdown.ccs,
+                        "score_1_10": round(breakdown.ccs / 10, 1),
+                        "components": {
+                            "d": breakdown.d,
+                            "s": breakdown.s,
+                            "n": breakdown.n,
+                            "a": breakdown.a,
+                            "r": breakdown.r,
+                        },
+                        "recommendedSubtasks": breakdown.recommended_subtasks,
+                        "confidence": breakdown.confidence,
+                        "modelClass": breakdown.model_class,
+                    },
+                    "order_hint": idx,
+                    "summary": node_spec.description,
+                }
             )
-            self._session.add(plan_node)
-            await self._session.flush()
-
-            features = ComplexityFeatures(
-                node_id=plan_node.id,
-                d=breakdown.d,
-                s=breakdown.s,
-                n=breakdown.n,
-                a=breakdown.a,
-                r=breakdown.r,
-                ccs=breakdown.ccs,
-                recommended_subtasks=breakdown.recommended_subtasks,
-                confidence=breakdown.confidence,
+            feature_rows.append(
+                {
+                    "node_id": node_id,
+                    "d": breakdown.d,
+                    "s": breakdown.s,
+                    "n": breakdown.n,
+                    "a": breakdown.a,
+                    "r": breakdown.r,
+                    "ccs": breakdown.ccs,
+                    "recommended_subtasks": breakdown.recommended_subtasks,
+                    "confidence": breakdown.confidence,
+                }
             )
-            self._session.add(features)
-
-    async def _persist_edges(self, plan: Plan, build: PlanBuildResult) -> None:
-        nodes = await self._session.execute(
-            select(PlanNode.id).where(PlanNode.plan_id == plan.id).order_by(PlanNode.order_hint)
+        if node_rows:
+            # ORM bulk INSERTs: one batched statement per table, no per-row unit-of-work objects.
+            await session.execute(insert(PlanNode), node_rows)
+            await session.execute(insert(ComplexityFeatures), feature_rows)
+        return node_ids
+
+    async def _persist_edges(
+        self, session: AsyncSession, plan: Plan, build: PlanBuildResult, id_map: list[str]
+    ) -> None:
+        if not build.edges:
+            return
+        await session.execute(
+            insert(PlanEdge),
+            [
+                {
+                    "plan_id": plan.id,
+                    "from_node": id_map[edge_spec.from_index],
+                    "to_node": id_map[edge_spec.to_index],
+                    "description": edge_spec.description,
+                    "artifact_type": edge_spec.artifact_type,
+                }
+                for edge_spec in build.edges
+            ],
         )
-        id_map = [row.id for row in nodes]
-        for edge_spec in build.edges:
-            edge = PlanEdge(
-                plan_id=plan.id,
-                from_node=id_map[edge_spec.from_index],
-                to_node=id_map[edge_spec.to_index],
-                description=edge_spec.description,
-                artifact_type=edge_spec.artifact_type,
-            )
-            self._session.add(edge)
 
-    async def _persist_candidates(self, plan: Plan, node_count: int) -> None:
-        values = [plan.score or 0, (plan.score or 0) * 0.95, (plan.score or 0) * 0.9]
+    async def _persist_candidates(self, session: AsyncSession, plan: Plan, node_count: int) -> None:
+        tuning = self._settings.tuning
+        search_params = {"ucb1_c": tuning.ucb1_c, "iterations": tuning.search_max_iters}
+        score = plan.score or 0
+        values = [score, score * 0.95, score * 0.9]
         for rank, value in enumerate(values, start=1):
             candidate = PlanCandidate(
                 plan_id=plan.id,
                 rank=rank,
                 value=round(value, 3),
-                params={"ucb1_c": self._settings.tuning.ucb1_c, "iterations": self._settings.tuning.search_max_iters},
+                params=dict(search_params),
                 trace={"nodes": node_count, "expansions": 3 + rank},
             )
-            self._session.add(candidate)
+            session.add(candidate)
 
-    async def _persist_audit(self, plan: Plan, params: PlanCreateParams) -> None:
+    async def _persist_audit(self, session: AsyncSession, plan: Plan, params: PlanCreateParams) -> None:
         audit = AuditLog(
             principal=params.principal,
             action="plan.created",
             new_val={"planId": plan.id, "projectId": params.project_id},
             correlation_id=params.correlation_id,
         )
-        self._session.add(audit)
+        session.add(audit)
+
+
+_orchestrator_singleton: PlannerOrchestrator | None = None
+
+
+def get_orchestrator() -> PlannerOrchestrator:
+    global _orchestrator_singleton
+    if _orchestrator_singleton is None:
+        _orchestrator_singleton = PlannerOrchestrator()
+    return _orchestrator_singleton
 
 
-__all__ = ["PlannerOrchestrator", "PlanCreateParams"]
+__all__ = ["PlannerOrchestrator", "PlanCreateParams", "get_orchestrator"]
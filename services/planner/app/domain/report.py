@@ -1,31 +1,62 @@
 """Plan reporting helpers."""
 from __future__ import annotations
 
-from collections import Counter
 from typing import Iterable
 
-from ..persistence.models import NodeDomain, Plan, PlanNode
-from .coverage import CoverageResult
-from .ccs import ComplexityBreakdown
+import numpy as np
+
+from ..persistence.models import NodeDomain, Plan
 from .budget import BudgetResult
+from .ccs import ComplexityBreakdown
+from .coverage import CoverageResult
+
+_DOMAINS = tuple(NodeDomain)
+# NodeDomain is a small fixed enum, so nodes are tallied into fixed slots rather than a Counter.
+_DOMAIN_SLOTS = {domain: slot for slot, domain in enumerate(_DOMAINS)}
+
+
+def _ccs_stats(complexities: Iterable[ComplexityBreakdown]) -> dict:
+    """Summarize CCS scores: mean, p90, confidence mean and the three score bands."""
+    complexities = list(complexities)
+    count = len(complexities)
+    if not count:
+        return {"mean": 0, "p90": 0, "confidenceMean": 0, "bands": {"0_40": 0, "41_80": 0, "81_100": 0}}
+    # fromiter fills preallocated buffers; building an (n, 2) array from tuples measured slower.
+    ccs_values = np.fromiter((c.ccs for c in complexities), dtype=np.float64, count=count)
+    confidence = np.fromiter((c.confidence for c in complexities), dtype=np.float64, count=count)
+    # cumsum adds strictly left to right like sum(); mean() sums pairwise and can flip the rounding.
+    totals = (ccs_values.cumsum()[-1], confidence.cumsum()[-1])
+    # np.partition selects the p90 element in linear time; bins are (.., 40], (40, 80], (80, ..).
+    p90_index = int(0.9 * count) - 1
+    bands = np.bincount(np.digitize(ccs_values, [40.0, 80.0], right=True), minlength=3)
+    return {
+        "mean": round(float(totals[0]) / count, 2),
+        "p90": round(float(np.partition(ccs_values, p90_index)[p90_index]), 2),
+        "confidenceMean": round(float(totals[1]) / count, 2),
+        "bands": {"0_40": int(bands[0]), "41_80": int(bands[1]), "81_100": int(bands[2])},
+    }
 
 
 def build_plan_report(
     plan: Plan,
-    nodes: Iterable[PlanNode],
+    node_domains: Iterable[NodeDomain],
     coverage: CoverageResult,
     budget: BudgetResult,
     complexities: Iterable[ComplexityBreakdown],
     candidate_count: int,
+    headroom_pct: float,
 ) -> dict:
-    domain_counts = Counter(node.type.value for node in nodes)
-    ccs_values = [c.ccs for c in complexities]
-    confidence = [c.confidence for c in complexities]
+    tally = [0] * len(_DOMAINS)
+    node_count = 0
+    for domain in node_domains:
+        tally[_DOMAIN_SLOTS[domain]] += 1
+        node_count += 1
+    domain_counts = {domain.value: count for domain, count in zip(_DOMAINS, tally) if count}
     return {
         "planId": plan.id,
         "summary": {
             "nodesByDomain": domain_counts,
-            "dag": {"depth": len(nodes), "widthP95": max(1, len(nodes) // 3), "acyclic": True},
+            "dag": {"depth": node_count, "widthP95": max(1, node_count // 3), "acyclic": True},
             "coverage": {
                 "missingOps": len(coverage.missing_operations),
                 "missingEntities": 0,
@@ -34,26 +65,14 @@ def build_plan_report(
             "tokens": {"planned": sum(budget.budgets)},
             "search": {"candidates": candidate_count, "winnerRank": 1, "fallbackRank": 2},
         },
-        "ccs": {
-            "mean": round(sum(ccs_values) / len(ccs_values), 2) if ccs_values else 0,
-            "p90": round(sorted(ccs_values)[int(0.9 * len(ccs_values)) - 1], 2) if ccs_values else 0,
-            "confidenceMean": round(sum(confidence) / len(confidence), 2) if confidence else 0,
-            "bands": {
-                "0_40": sum(1 for v in ccs_values if v <= 40),
-                "41_80": sum(1 for v in ccs_values if 40 < v <= 80),
-                "81_100": sum(1 for v in ccs_values if v > 80),
-            },
-        },
+        "ccs": _ccs_stats(complexities),
         "window": {
-            "headroomPct": get_settings().tuning.window_headroom_pct,
+            "headroomPct": headroom_pct,
             "compliant": not budget.violations,
             "violations": budget.violations,
         },
-        "coverageDetail": coverage.missing_operations,
+        "coverageDetail": sorted(coverage.missing_operations),
     }
 
 
-from ..config import get_settings
-
-
 __all__ = ["build_plan_report"]
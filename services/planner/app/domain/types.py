@@ -2,25 +2,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Sequence
 
 from ..persistence.models import NodeDomain
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeSpec:
     domain: NodeDomain
     title: str
     description: str
     instructions: dict[str, Any]
-    acceptance_criteria: list[str]
+    acceptance_criteria: Sequence[str]
     artifacts_in: list[dict[str, Any]] = field(default_factory=list)
     artifacts_out: list[dict[str, Any]] = field(default_factory=list)
     contract_refs: list[str] = field(default_factory=list)
     requirements_refs: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeSpec:
     from_index: int
     to_index: int
@@ -28,7 +28,7 @@ class EdgeSpec:
     artifact_type: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanBuildResult:
     nodes: list[NodeSpec]
     edges: list[EdgeSpec]
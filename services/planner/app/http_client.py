@@ -0,0 +1,28 @@
+"""Shared outbound HTTP client for the planner service."""
+from __future__ import annotations
+
+import httpx
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return a singleton async HTTP client with a pooled, keep-alive transport."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=45.0,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (used on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+__all__ = ["get_http_client", "close_http_client"]
@@ -1,13 +1,32 @@
 """FastAPI application entrypoint."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from .api import executor_callbacks, plans
 from .config import get_settings
+from .domain.callback_queue import close_callback_batcher
+from .http_client import close_http_client
 from .observability.otel import configure_telemetry
+from .persistence.cache import close_response_cache
 from .persistence.db import init_db
+from .persistence.storage import close_artifact_storage
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:  # pragma: no cover - FastAPI lifecycle
+    await init_db()
+    try:
+        yield
+    finally:
+        await close_callback_batcher()
+        await close_http_client()
+        await close_response_cache()
+        await close_artifact_storage()
 
 
 def create_app() -> FastAPI:
@@ -18,14 +37,11 @@ def create_app() -> FastAPI:
         openapi_version="3.1.0",
         docs_url="/docs",
         redoc_url=None,
+        lifespan=_lifespan,
     )
 
     configure_telemetry()
 
-    @app.on_event("startup")
-    async def _startup() -> None:  # pragma: no cover - FastAPI lifecycle
-        await init_db()
-
     @app.exception_handler(Exception)
     async def _generic_exception_handler(request: Request, exc: Exception):  # pragma: no cover - fallback
         return JSONResponse(
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 from opentelemetry import metrics, trace
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter as GrpcMetricExporter
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter as GrpcSpanExporter
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.metrics import MeterProvider
@@ -13,22 +15,49 @@ from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from ..config import get_settings
 
 
+_configured = False
+
+
 def configure_telemetry() -> None:
-    """Configure tracing and metrics exporters."""
+    """Configure tracing and metrics exporters once per process.
+
+    OpenTelemetry only honours the first global provider, so repeated app creation (tests,
+    reloads) would otherwise just leak providers and their background export threads.
+    """
+    global _configured
+    if _configured:
+        return
     settings = get_settings()
     resource = Resource(attributes={SERVICE_NAME: settings.observability.otel_service_name})
 
     tracer_provider = TracerProvider(resource=resource)
-    trace.set_tracer_provider(tracer_provider)
-
-    if settings.observability.otel_exporter_otlp_endpoint:
-        span_exporter = OTLPSpanExporter(endpoint=settings.observability.otel_exporter_otlp_endpoint)
-        tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
-
-        metric_exporter = OTLPMetricExporter(endpoint=settings.observability.otel_exporter_otlp_endpoint)
+    meter_provider: MeterProvider | None = None
+
+    observability = settings.observability
+    if observability.otel_exporter_otlp_endpoint:
+        grpc = observability.otel_exporter_otlp_protocol == "grpc"
+        span_exporter_cls = GrpcSpanExporter if grpc else OTLPSpanExporter
+        metric_exporter_cls = GrpcMetricExporter if grpc else OTLPMetricExporter
+
+        span_exporter = span_exporter_cls(endpoint=observability.otel_exporter_otlp_endpoint)
+        tracer_provider.add_span_processor(
+            BatchSpanProcessor(
+                span_exporter,
+                max_queue_size=observability.otel_span_queue_size,
+                schedule_delay_millis=observability.otel_span_schedule_delay_ms,
+                max_export_batch_size=observability.otel_span_batch_size,
+            )
+        )
+
+        metric_exporter = metric_exporter_cls(endpoint=observability.otel_exporter_otlp_endpoint)
         reader = PeriodicExportingMetricReader(metric_exporter)
         meter_provider = MeterProvider(resource=resource, metric_readers=[reader])
+
+    # Install the providers only once everything built, so a failed setup can be retried.
+    trace.set_tracer_provider(tracer_provider)
+    if meter_provider is not None:
         metrics.set_meter_provider(meter_provider)
+    _configured = True
 
 
 __all__ = ["configure_telemetry"]
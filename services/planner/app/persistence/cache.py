@@ -0,0 +1,72 @@
+"""Redis-backed response cache for read-mostly plan endpoints."""
+from __future__ import annotations
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+
+class ResponseCache:
+    """Store serialized response bodies under versioned keys.
+
+    Keys embed the plan version (``updated_at``), so entries never need explicit
+    invalidation; stale versions simply age out. Cache failures are logged and
+    treated as misses so Redis is never on the critical path.
+    """
+
+    def __init__(self, client: Redis | None, ttl_s: int = 3600, prefix: str = "planner") -> None:
+        self._client = client
+        self._ttl_s = ttl_s
+        self._prefix = prefix
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    async def get(self, key: str) -> bytes | None:
+        if self._client is None:
+            return None
+        try:
+            return await self._client.get(f"{self._prefix}:{key}")
+        except RedisError as exc:  # pragma: no cover - depends on Redis availability
+            logger.warning("response_cache.get_failed", key=key, error=str(exc))
+            return None
+
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.set(f"{self._prefix}:{key}", value, ex=expire or self._ttl_s)
+        except RedisError as exc:  # pragma: no cover - depends on Redis availability
+            logger.warning("response_cache.set_failed", key=key, error=str(exc))
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+
+_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return a singleton cache; disabled when no Redis URL is configured."""
+    global _cache
+    if _cache is None:
+        storage = get_settings().storage
+        client = Redis.from_url(storage.redis_url) if storage.redis_url else None
+        _cache = ResponseCache(client, ttl_s=storage.response_cache_ttl_s)
+    return _cache
+
+
+async def close_response_cache() -> None:
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
+
+
+__all__ = ["ResponseCache", "get_response_cache", "close_response_cache"]
@@ -2,29 +2,52 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import Any, AsyncIterator
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from ..config import get_settings
+from ..config import StorageSettings, get_settings
 
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
+def _engine_options(storage: StorageSettings) -> dict[str, Any]:
+    """Return pool options for the configured backend."""
+    options: dict[str, Any] = {"pool_pre_ping": storage.pool_pre_ping}
+    if make_url(storage.database_url).get_backend_name() != "sqlite":
+        # SQLite (dev/tests) may use a static or singleton pool that rejects sizing arguments.
+        options.update(
+            pool_size=storage.pool_size,
+            max_overflow=storage.max_overflow,
+            pool_timeout=storage.pool_timeout,
+            pool_recycle=storage.pool_recycle,
+            # LIFO checkout keeps a few hot connections busy and lets surplus ones idle out.
+            pool_use_lifo=storage.pool_use_lifo,
+        )
+    return options
+
+
 def get_engine() -> AsyncEngine:
     """Return a singleton async engine."""
     global _engine, _session_factory
     if _engine is None:
         settings = get_settings()
-        _engine = create_async_engine(settings.storage.database_url, future=True, echo=False)
+        _engine = create_async_engine(
+            settings.storage.database_url,
+            future=True,
+            echo=False,
+            **_engine_options(settings.storage),
+        )
         _session_factory = async_sessionmaker(_engine, expire_on_commit=False)
     return _engine
 
 
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """Return a session factory bound to the engine."""
-    get_engine()
+    if _session_factory is None:
+        get_engine()
     assert _session_factory is not None
     return _session_factory
 
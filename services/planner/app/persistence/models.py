@@ -6,10 +6,41 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import JSON, Enum, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint
+import numpy as np
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    Numeric,
+    String,
+    Text,
+    UniqueConstraint,
+    Uuid,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
+# Keys stay canonical UUID strings in Python; Postgres stores them natively in 16 bytes.
+UUIDKey = String(36).with_variant(Uuid(as_uuid=False), "postgresql")
+# Postgres keeps documents pre-parsed (and indexable) as JSONB; other backends use plain JSON.
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+def is_uuid_key(value: str) -> bool:
+    """Return whether ``value`` is a canonical key; native UUID columns reject anything else."""
+    try:
+        # Keys are generated as canonical strings, so other spellings never named a row.
+        return str(uuid.UUID(value)) == value
+    except ValueError:
+        return False
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -32,7 +63,7 @@ class NodeDomain(enum.Enum):
 class Plan(Base):
     __tablename__ = "plan"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     project_id: Mapped[str] = mapped_column(String, nullable=False)
     run_id: Mapped[str] = mapped_column(String, nullable=False)
     contract_hash: Mapped[str] = mapped_column(String, nullable=False)
@@ -40,55 +71,80 @@ class Plan(Base):
     score: Mapped[float | None] = mapped_column(Numeric(5, 2))
     wall_time_ms: Mapped[int | None] = mapped_column(Integer)
     token_cost: Mapped[int | None] = mapped_column(Integer)
-    params: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    params: Mapped[dict[str, Any]] = mapped_column(JSONDocument, nullable=False, default=dict)
     report_ref: Mapped[str | None] = mapped_column(String)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
-    deleted_at: Mapped[datetime | None] = mapped_column(default=None)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
 
-    nodes: Mapped[list["PlanNode"]] = relationship(back_populates="plan", cascade="all, delete-orphan")
-    edges: Mapped[list["PlanEdge"]] = relationship(back_populates="plan", cascade="all, delete-orphan")
-    candidates: Mapped[list["PlanCandidate"]] = relationship(back_populates="plan", cascade="all, delete-orphan")
+    # Graph collections are never lazy-loaded: a per-row fetch would turn every plan read into N+1
+    # queries (and async sessions cannot run them implicitly anyway). Callers select the columns
+    # they need or request ``selectinload`` explicitly.
+    nodes: Mapped[list["PlanNode"]] = relationship(
+        back_populates="plan", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    edges: Mapped[list["PlanEdge"]] = relationship(
+        back_populates="plan", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    candidates: Mapped[list["PlanCandidate"]] = relationship(
+        back_populates="plan", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
 
     __table_args__ = (UniqueConstraint("project_id", "run_id", name="uq_plan_project_run"),)
+    # Timestamps are written by the database; fetch them back with the INSERT/UPDATE so summaries
+    # built in the same session never trigger an implicit (async-unsafe) refresh.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class PlanNode(Base):
     __tablename__ = "plan_node"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     plan_id: Mapped[str] = mapped_column(ForeignKey("plan.id"), nullable=False)
     type: Mapped[NodeDomain] = mapped_column(Enum(NodeDomain), nullable=False)
     label: Mapped[str] = mapped_column(String, nullable=False)
-    instructions: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
-    artifacts_in: Mapped[list[dict[str, Any]]] = mapped_column(JSON, nullable=False, default=list)
-    artifacts_out: Mapped[list[dict[str, Any]]] = mapped_column(JSON, nullable=False, default=list)
+    instructions: Mapped[dict[str, Any]] = mapped_column(JSONDocument, nullable=False, default=dict)
+    artifacts_in: Mapped[list[dict[str, Any]]] = mapped_column(JSONDocument, nullable=False, default=list)
+    artifacts_out: Mapped[list[dict[str, Any]]] = mapped_column(JSONDocument, nullable=False, default=list)
     token_budget: Mapped[int] = mapped_column(Integer, nullable=False)
-    score: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    score: Mapped[dict[str, Any]] = mapped_column(JSONDocument, nullable=False, default=dict)
     order_hint: Mapped[int | None] = mapped_column(Integer)
     summary: Mapped[str | None] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
 
     plan: Mapped[Plan] = relationship(back_populates="nodes")
     outgoing: Mapped[list["PlanEdge"]] = relationship(
         back_populates="source",
         cascade="all, delete-orphan",
         foreign_keys="PlanEdge.from_node",
+        lazy="raise_on_sql",
     )
     incoming: Mapped[list["PlanEdge"]] = relationship(
         back_populates="target",
         cascade="all, delete-orphan",
         foreign_keys="PlanEdge.to_node",
+        lazy="raise_on_sql",
+    )
+    complexity: Mapped[ComplexityFeatures | None] = relationship(
+        back_populates="node", uselist=False, cascade="all, delete-orphan", lazy="raise_on_sql"
     )
-    complexity: Mapped[ComplexityFeatures | None] = relationship(back_populates="node", uselist=False, cascade="all, delete-orphan")
-    context_cards: Mapped[list["ContextCard"]] = relationship(back_populates="node", cascade="all, delete-orphan")
+    context_cards: Mapped[list["ContextCard"]] = relationship(
+        back_populates="node", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+
+    # Nodes are always read per plan in order_hint order.
+    __table_args__ = (Index("ix_plan_node_plan_order", "plan_id", "order_hint"),)
 
 
 class PlanEdge(Base):
     __tablename__ = "plan_edge"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     plan_id: Mapped[str] = mapped_column(ForeignKey("plan.id"), nullable=False)
     from_node: Mapped[str] = mapped_column(ForeignKey("plan_node.id"), nullable=False)
     to_node: Mapped[str] = mapped_column(ForeignKey("plan_node.id"), nullable=False)
@@ -99,16 +155,22 @@ class PlanEdge(Base):
     source: Mapped[PlanNode] = relationship(foreign_keys=[from_node], back_populates="outgoing")
     target: Mapped[PlanNode] = relationship(foreign_keys=[to_node], back_populates="incoming")
 
+    # Dependency maps group a plan's edges by target; from_node backs the source-side FK.
+    __table_args__ = (
+        Index("ix_plan_edge_plan_to", "plan_id", "to_node"),
+        Index("ix_plan_edge_from_node", "from_node"),
+    )
+
 
 class PlanCandidate(Base):
     __tablename__ = "plan_candidate"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     plan_id: Mapped[str] = mapped_column(ForeignKey("plan.id"), nullable=False)
     rank: Mapped[int] = mapped_column(Integer, nullable=False)
     value: Mapped[float] = mapped_column(Numeric(6, 3), nullable=False)
-    params: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
-    trace: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    params: Mapped[dict[str, Any]] = mapped_column(JSONDocument, nullable=False, default=dict)
+    trace: Mapped[dict[str, Any]] = mapped_column(JSONDocument, nullable=False, default=dict)
 
     plan: Mapped[Plan] = relationship(back_populates="candidates")
 
@@ -118,18 +180,29 @@ class PlanCandidate(Base):
 class ContextCard(Base):
     __tablename__ = "context_card"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    node_id: Mapped[str] = mapped_column(ForeignKey("plan_node.id"), nullable=False)
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
+    node_id: Mapped[str] = mapped_column(ForeignKey("plan_node.id"), nullable=False, index=True)
     contract_slice_ref: Mapped[str] = mapped_column(String, nullable=False)
-    interfaces: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
-    schema_hashes: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    interfaces: Mapped[dict[str, Any]] = mapped_column(JSONDocument, nullable=False, default=dict)
+    schema_hashes: Mapped[dict[str, Any]] = mapped_column(JSONDocument, nullable=False, default=dict)
     summary: Mapped[str] = mapped_column(Text, nullable=False)
-    citations: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
-    embedding: Mapped[list[float] | None] = mapped_column(JSON)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    citations: Mapped[list[str]] = mapped_column(JSONDocument, nullable=False, default=list)
+    # Packed little-endian float32: 4 bytes per dimension instead of ~15 characters of JSON text.
+    embedding_blob: Mapped[bytes | None] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     node: Mapped[PlanNode] = relationship(back_populates="context_cards")
 
+    @property
+    def embedding(self) -> list[float] | None:
+        if self.embedding_blob is None:
+            return None
+        return np.frombuffer(self.embedding_blob, dtype="<f4").tolist()
+
+    @embedding.setter
+    def embedding(self, values: list[float] | None) -> None:
+        self.embedding_blob = None if values is None else np.asarray(values, dtype="<f4").tobytes()
+
 
 class ComplexityFeatures(Base):
     __tablename__ = "complexity_features"
@@ -150,13 +223,13 @@ class ComplexityFeatures(Base):
 class AuditLog(Base):
     __tablename__ = "audit_log"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     principal: Mapped[str] = mapped_column(String, nullable=False)
     action: Mapped[str] = mapped_column(String, nullable=False)
-    old_val: Mapped[dict[str, Any] | None] = mapped_column(JSON)
-    new_val: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    old_val: Mapped[dict[str, Any] | None] = mapped_column(JSONDocument)
+    new_val: Mapped[dict[str, Any] | None] = mapped_column(JSONDocument)
     correlation_id: Mapped[str] = mapped_column(String, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
 __all__ = [
@@ -170,4 +243,7 @@ __all__ = [
     "AuditLog",
     "PlanStatus",
     "NodeDomain",
+    "UUIDKey",
+    "JSONDocument",
+    "is_uuid_key",
 ]
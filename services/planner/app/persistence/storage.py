@@ -1,50 +1,135 @@
 """Artifact storage helpers (S3/MinIO)."""
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
+import os
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from pathlib import Path
 from typing import Any
 
 import aioboto3
+import orjson
+from botocore.exceptions import ClientError
 
 from ..config import get_settings
 
+_SEEN_KEYS_CAPACITY = 4096
+_MISSING_OBJECT_CODES = frozenset({"404", "NoSuchKey", "NotFound"})
+
 
 class ArtifactStorage:
-    """Persist artifacts to S3/MinIO using content-hash identifiers."""
+    """Persist artifacts to S3/MinIO using content-hash identifiers.
+
+    The S3 client is opened on first use and kept for the life of the instance so
+    its connection pool is reused across artifacts; :meth:`close` releases it.
+    Keys are content hashes, so an object that already exists is never rewritten.
+    """
 
     def __init__(self) -> None:
         self._settings = get_settings().storage
+        self._client: Any = None
+        self._client_stack: AsyncExitStack | None = None
+        self._client_lock = asyncio.Lock()
+        self._seen_keys: OrderedDict[str, None] = OrderedDict()
+
+    async def _get_client(self) -> Any:
+        if self._client is not None:
+            return self._client
+        async with self._client_lock:
+            if self._client is None:
+                stack = AsyncExitStack()
+                self._client = await stack.enter_async_context(
+                    aioboto3.Session().client(
+                        "s3",
+                        endpoint_url=self._settings.s3_endpoint,
+                        region_name=self._settings.s3_region,
+                    )
+                )
+                self._client_stack = stack
+        return self._client
+
+    async def close(self) -> None:
+        if self._client_stack is not None:
+            await self._client_stack.aclose()
+        self._client = None
+        self._client_stack = None
 
     async def put_json(self, data: dict[str, Any]) -> str:
         """Store JSON data and return content-hash reference."""
-        payload = json.dumps(data, sort_keys=True).encode("utf-8")
+        payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
         return await self._put_bytes(payload, suffix=".json")
 
+    async def get_json(self, ref: str) -> dict[str, Any]:
+        """Load a JSON artifact previously stored by :meth:`put_json`."""
+        if ref.startswith("file://"):
+            payload = await asyncio.to_thread(Path(ref[len("file://") :]).read_bytes)
+            return orjson.loads(payload)
+        bucket, _, key = ref[len("s3://") :].partition("/")
+        client = await self._get_client()
+        response = await client.get_object(Bucket=bucket, Key=key)
+        async with response["Body"] as body:
+            payload = await body.read()
+        return orjson.loads(payload)
+
     async def _put_bytes(self, payload: bytes, suffix: str = "") -> str:
-        hasher = hashlib.sha256()
-        hasher.update(payload)
-        digest = hasher.hexdigest()
+        # One call over the contiguous buffer; the digest is an address, not a security boundary.
+        digest = hashlib.sha256(payload, usedforsecurity=False).hexdigest()
         key = f"artifacts/{digest}{suffix}"
 
         if not self._settings.s3_bucket:
             # Dev mode: write to local file system for traceability
             path = f"./.artifacts/{digest}{suffix}"
-            import os
-
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, "wb") as handle:
-                handle.write(payload)
+            await asyncio.to_thread(_write_local, path, payload)
             return f"file://{path}"
 
-        session = aioboto3.Session()
-        async with session.client(
-            "s3",
-            endpoint_url=self._settings.s3_endpoint,
-            region_name=self._settings.s3_region,
-        ) as client:
+        ref = f"s3://{self._settings.s3_bucket}/{key}"
+        if key in self._seen_keys:
+            self._seen_keys.move_to_end(key)
+            return ref
+        client = await self._get_client()
+        if not await self._object_exists(client, key):
             await client.put_object(Bucket=self._settings.s3_bucket, Key=key, Body=payload)
-        return f"s3://{self._settings.s3_bucket}/{key}"
+        self._seen_keys[key] = None
+        if len(self._seen_keys) > _SEEN_KEYS_CAPACITY:
+            self._seen_keys.popitem(last=False)
+        return ref
+
+    async def _object_exists(self, client: Any, key: str) -> bool:
+        try:
+            await client.head_object(Bucket=self._settings.s3_bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in _MISSING_OBJECT_CODES:
+                return False
+            raise
+        return True
+
+
+def _write_local(path: str, payload: bytes) -> None:
+    """Blocking dev-mode write; run off the event loop."""
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(payload)
+
+
+_storage: ArtifactStorage | None = None
+
+
+def get_artifact_storage() -> ArtifactStorage:
+    global _storage
+    if _storage is None:
+        _storage = ArtifactStorage()
+    return _storage
+
+
+async def close_artifact_storage() -> None:
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
 
 
-__all__ = ["ArtifactStorage"]
+__all__ = ["ArtifactStorage", "get_artifact_storage", "close_artifact_storage"]
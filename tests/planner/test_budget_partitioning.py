@@ -11,7 +11,7 @@ planner_pkg.app = stub
 
 import pytest
 
-from services.planner.app.domain.budget import plan_budgets
+from services.planner.app.domain.budget import _fit_word_count, estimate_tokens, plan_budgets
 from services.planner.app.domain.types import EdgeSpec, NodeSpec
 from services.planner.app.persistence.models import NodeDomain
 
@@ -116,3 +116,14 @@ def test_plan_budgets_rewires_edges_for_partition(tuned_settings):
     assert (part_indices[-1], end_index) in edge_pairs
     assert edge_pairs[(part_indices[-1], end_index)] == "Backend to tests"
 
+
+def test_fit_word_count_matches_incremental_estimate():
+    words = [f"w{i}" for i in range(60)]
+    for capacity in range(0, 400, 7):
+        for task_count, criteria_count, floor in [(0, 0, 64), (2, 1, 64), (1, 3, 300), (0, 0, 500)]:
+            expected = 0
+            for count in range(len(words) + 1):
+                estimate = estimate_tokens(" ".join(words[:count])) + task_count * 40 + criteria_count * 20
+                if max(estimate, floor) <= capacity:
+                    expected = count
+            assert _fit_word_count(len(words), capacity, task_count, criteria_count, floor) == expected
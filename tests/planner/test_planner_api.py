@@ -4,13 +4,18 @@ import uuid
 
 import pytest
 from httpx import AsyncClient, ASGITransport
+from openapi_spec_validator import validate_spec
 
 os.environ.setdefault("PLANNER_STORAGE__DATABASE_URL", "sqlite+aiosqlite:///./test_planner.db")
 os.environ.setdefault("PLANNER_INTELLIGENCE_STUDIO__API_KEY", "test-key")
 os.environ.setdefault("PLANNER_INTELLIGENCE_STUDIO__FLOW_URL", "http://localhost:9999/mock")
 
 from services.planner.app.main import app  # noqa: E402
-from services.planner.app.persistence.db import init_db  # noqa: E402
+from services.planner.app.domain.callback_queue import CallbackBatcher, CallbackEvent, get_callback_batcher  # noqa: E402
+from services.planner.app.domain.ingest import parse_prd, synthesize_contract  # noqa: E402
+from services.planner.app.persistence.cache import ResponseCache, get_response_cache  # noqa: E402
+from services.planner.app.persistence.db import init_db, session_scope  # noqa: E402
+from services.planner.app.persistence.models import ContextCard  # noqa: E402
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -63,6 +68,13 @@ async def test_create_plan_and_retrieve():
         assert tasks_resp.status_code == 200
         tasks = tasks_resp.json()
         assert any(task["title"].startswith("Request: provision") for task in tasks)
+        by_title = {task["title"]: task for task in tasks}
+        repo_task = by_title["Request: provision repository scaffold"]
+        assert repo_task["dependencies"] == []
+        db_task = next(task for task in tasks if task["domain"] == "DB")
+        assert db_task["dependencies"] == [repo_task["id"]]
+        test_task = by_title["Construct integration and contract tests"]
+        assert len(test_task["dependencies"]) > 1
 
         graph_resp = await client.get(f"/plans/{plan_id}/graph")
         assert graph_resp.status_code == 200
@@ -71,6 +83,16 @@ async def test_create_plan_and_retrieve():
 
         report_resp = await client.get(f"/plans/{plan_id}/report")
         assert report_resp.status_code == 200
+        assert report_resp.headers["content-type"] == "application/json"
+        assert report_resp.json()["planId"] == plan_id
+
+        validated_resp = await client.get(f"/plans/{plan_id}/report", params={"validate": "true"})
+        assert validated_resp.status_code == 200
+        assert validated_resp.json() == report_resp.json()
+
+        rerun_resp = await client.post(f"/plans/{plan_id}/rerun")
+        assert rerun_resp.status_code == 200, rerun_resp.text
+        assert rerun_resp.json()["coverage"]["totalOperations"] == data["coverage"]["totalOperations"]
 
 
 @pytest.mark.asyncio
@@ -85,6 +107,8 @@ Warehouse: Physical location where inventory is stored.
 System must track widget stock levels across warehouses.
 Warehouse should synchronize counts nightly.
 """
+    # Synthesized contracts skip validation at ingest time, so they must always be valid.
+    validate_spec(synthesize_contract(parse_prd(prd_text)))
     request_payload = {
         "projectId": "proj-456",
         "runId": str(uuid.uuid4()),
@@ -122,8 +146,115 @@ async def test_executor_callback_creates_context_card():
             f"/executor/callbacks/{node_id}",
             json={"status": "completed", "artifactsOut": [{"ref": "s3://bucket/artifact"}]},
         )
-        assert callback_resp.status_code == 200
+        assert callback_resp.status_code == 202
         payload = callback_resp.json()
-        assert "contextCardId" in payload
+        assert payload["contextCardId"]
+
+        second_resp = await client.post(
+            f"/executor/callbacks/{node_id}",
+            json={"status": "completed", "artifactsOut": [{"ref": "s3://bucket/second"}]},
+        )
+        assert second_resp.status_code == 202
+        await get_callback_batcher().join()
+
+        tasks_resp = await client.get(f"/plans/{plan_id}/tasks.json")
+        node = next(task for task in tasks_resp.json() if task["id"] == node_id)
+        assert node["artifactsOut"][-2:] == [{"ref": "s3://bucket/artifact"}, {"ref": "s3://bucket/second"}]
+        async with session_scope() as session:
+            card = await session.get(ContextCard, payload["contextCardId"])
+            assert card is not None
+            assert card.node_id == node_id
+
+        missing_resp = await client.post(f"/executor/callbacks/{uuid.uuid4()}", json={"status": "completed"})
+        assert missing_resp.status_code == 404
+
+
+class _PoisonCardService:
+    def __init__(self, poison_id: str) -> None:
+        self.poison_id = poison_id
+        self.calls = 0
+
+    async def summarize(self, node, contract_slice) -> str:
+        self.calls += 1
+        if node.id == self.poison_id:
+            raise RuntimeError("summary failed")
+        return f"summary of {node.label}"
+
+
+@pytest.mark.asyncio
+async def test_callback_flush_failure_keeps_other_events():
+    request_payload = {
+        "projectId": "proj-321",
+        "runId": str(uuid.uuid4()),
+        "prd": {"text": "# Overview\nNo UI."},
+        "contract": {"document": sample_contract()},
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        plan_id = (await client.post("/plans", json=request_payload)).json()["id"]
+        tasks = (await client.get(f"/plans/{plan_id}/tasks.json")).json()
+    good_id, poison_id, broken_id = (task["id"] for task in tasks[:3])
+
+    cards = _PoisonCardService(poison_id)
+    batcher = CallbackBatcher(max_batch=3, max_wait_s=1.0, card_service=cards)
+    good = CallbackEvent(task_id=good_id, artifacts_out=[{"ref": "s3://bucket/good"}])
+    poison = CallbackEvent(task_id=poison_id, artifacts_out=[{"ref": "s3://bucket/poison"}])
+    # Not JSON-serializable, so the batch write fails and is replayed per event.
+    broken = CallbackEvent(task_id=broken_id, artifacts_out=[{"ref": object()}])
+    for event in (good, poison, broken):
+        await batcher.submit(event)
+    await batcher.close()
+
+    assert cards.calls == 3
+    async with session_scope() as session:
+        assert await session.get(ContextCard, good.card_id) is not None
+        assert await session.get(ContextCard, poison.card_id) is None
+        assert await session.get(ContextCard, broken.card_id) is None
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        nodes = {task["id"]: task for task in (await client.get(f"/plans/{plan_id}/tasks.json")).json()}
+    assert nodes[good_id]["artifactsOut"][-1] == {"ref": "s3://bucket/good"}
+    assert {"ref": "s3://bucket/poison"} not in nodes[poison_id]["artifactsOut"]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.store[key] = value
+
+
+@pytest.mark.asyncio
+async def test_graph_and_summary_are_served_from_cache():
+    fake = _FakeRedis()
+    app.dependency_overrides[get_response_cache] = lambda: ResponseCache(fake)
+    request_payload = {
+        "projectId": "proj-789",
+        "runId": str(uuid.uuid4()),
+        "prd": {"text": "# Overview\nNo UI."},
+        "contract": {"document": sample_contract()},
+    }
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            plan_id = (await client.post("/plans", json=request_payload)).json()["id"]
+            first_graph = await client.get(f"/plans/{plan_id}/graph")
+            first_plan = await client.get(f"/plans/{plan_id}")
+            assert first_graph.status_code == 200
+            assert first_plan.status_code == 200
+            assert any(key.startswith(f"planner:graph:{plan_id}:") for key in fake.store)
+            assert any(key.startswith(f"planner:plan:{plan_id}:") for key in fake.store)
 
+            second_graph = await client.get(f"/plans/{plan_id}/graph")
+            second_plan = await client.get(f"/plans/{plan_id}")
+            assert second_graph.json() == first_graph.json()
+            assert second_plan.json() == first_plan.json()
+            assert second_plan.json()["projectId"] == "proj-789"
 
+            missing = await client.get(f"/plans/{uuid.uuid4()}/graph")
+            assert missing.status_code == 404
+            malformed = await client.get("/plans/not-a-plan-id/graph")
+            assert malformed.status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_response_cache, None)